@@ -0,0 +1,128 @@
+"""Benchmark of sparkline generation and caching at 1,000 tickers.
+
+Synthetic random-walk prices replace Yahoo Finance. The stage benchmark runs
+the real metrics + sparklines stage against a fake yf.Ticker that counts
+history() calls (with an optional simulated latency per call); the cache
+benchmark only measures SVG generation and cache lookups.
+
+Run from the app/ directory with:
+    python -m benchmarks.bench_sparkline
+"""
+
+import argparse
+import tempfile
+import time
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.data import stock_data
+from src.utils import email_formatter
+from src.utils.sparkline import SparklineCache
+
+
+def make_closes(n_tickers: int, days: int, seed: int = 0) -> dict[str, pd.Series]:
+    """Random-walk close prices for n_tickers over the last `days` business days."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2025-10-03", periods=days)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_tickers, days)), axis=1))
+    return {f"TICK{i}": pd.Series(prices[i], index=dates) for i in range(n_tickers)}
+
+
+class FakeTicker:
+    """Stands in for yf.Ticker, serving slices of a synthetic daily history."""
+
+    calls = 0
+    latency = 0.0
+    histories: dict[str, pd.DataFrame] = {}
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+
+    def history(self, period: str) -> pd.DataFrame:
+        FakeTicker.calls += 1
+        time.sleep(FakeTicker.latency)
+        return FakeTicker.histories[self.ticker].tail(int(period.rstrip("d")))
+
+
+def make_histories(closes: dict[str, pd.Series]) -> dict[str, pd.DataFrame]:
+    """Daily High/Low/Close/Volume frames around the close prices."""
+    rng = np.random.default_rng(1)
+    return {
+        ticker: pd.DataFrame(
+            {
+                "High": series * 1.01,
+                "Low": series * 0.99,
+                "Close": series,
+                "Volume": rng.integers(1_000_000, 5_000_000, len(series)),
+            },
+            index=series.index,
+        )
+        for ticker, series in closes.items()
+    }
+
+
+def timed(label: str, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<38} {elapsed * 1000:8.1f} ms")
+    return elapsed
+
+
+def run_stage(closes: dict[str, pd.Series], latency_ms: float) -> None:
+    """Metrics alone vs metrics + sparklines, as run by the newsletter preview."""
+    FakeTicker.histories = make_histories(closes)
+    FakeTicker.latency = latency_ms / 1000
+    tickers = list(closes)
+    print(f"Stage ({latency_ms:g} ms simulated latency per history() call)")
+
+    with mock.patch.object(stock_data.yf, "Ticker", FakeTicker):
+        for label, stage in [
+            ("Metrics", lambda: email_formatter.fetch_metrics(tickers)),
+            ("Metrics + sparklines", lambda: email_formatter.fetch_metrics_and_sparklines(tickers)),
+        ]:
+            FakeTicker.calls = 0
+            timed(label, stage)
+            print(f"{'':<38} {FakeTicker.calls / len(tickers):8.1f} history() calls per ticker")
+    print()
+
+
+def run(n_tickers: int, days: int, latency_ms: float) -> None:
+    closes = make_closes(n_tickers, days)
+    print(f"{n_tickers} tickers, {days} bars each\n")
+
+    run_stage(closes, latency_ms)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = SparklineCache(cache_dir)
+        timed("Cold (render + write to disk)", lambda: cache.get_many(closes))
+        timed("Warm (in-memory cache)", lambda: cache.get_many(closes))
+        timed("Next run (disk cache, new process)", lambda: SparklineCache(cache_dir).get_many(closes))
+
+        # A new bar for 10% of the tickers invalidates only their sparklines
+        updated = dict(closes)
+        for ticker in list(closes)[: n_tickers // 10]:
+            series = closes[ticker]
+            next_day = series.index[-1] + pd.offsets.BDay()
+            updated[ticker] = pd.concat([series.iloc[1:], pd.Series([series.iloc[-1]], index=[next_day])])
+        next_cache = SparklineCache(cache_dir)
+        timed("Next day (10% of tickers changed)", lambda: next_cache.get_many(updated))
+        print(f"\nNext day cache: {next_cache.hits} hits, {next_cache.misses} misses")
+
+    for fmt, width in [("svg", 60), ("blocks", 12)]:
+        sparklines = SparklineCache(width=width, fmt=fmt).get_many(closes)
+        # Size in the ASCII-only email HTML, where each block is a character reference
+        sizes = [len(sparkline.encode("ascii", "xmlcharrefreplace")) for sparkline in sparklines.values()]
+        print(f"{fmt} size: {np.mean(sizes):.0f} bytes on average, {sum(sizes) / 1024:.0f} KB in total")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    run(args.tickers, args.days, args.latency_ms)
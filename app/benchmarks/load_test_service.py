@@ -0,0 +1,85 @@
+"""Load test of the service mode against local fakes.
+
+Yahoo Finance and the LLM are replaced by fakes with a fixed latency, so the
+numbers measure the service overhead and the effect of the shared caches.
+
+Run from the app/ directory with:
+    python -m benchmarks.load_test_service
+"""
+
+import argparse
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+
+from service import NewsletterService, create_app
+
+TICKERS = [f"TICK{i}" for i in range(50)]
+
+# Keep per-request client logs out of the report
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def make_fakes(latency: float):
+    """Fake loaders sleeping `latency` seconds and counting their calls."""
+    calls = {"metrics": 0, "news": 0}
+    lock = threading.Lock()
+
+    def metrics_loader(ticker: str) -> dict:
+        with lock:
+            calls["metrics"] += 1
+        time.sleep(latency)
+        return {
+            "Ticker": ticker,
+            "Volatility (10d %)": round(random.uniform(1, 10), 2),
+            "SMA 50d Ratio": round(random.uniform(0.8, 1.2), 2),
+            "Momentum (10d %)": round(random.uniform(-10, 10), 2),
+            "Volume Ratio (10d)": round(random.uniform(0.5, 2), 2),
+        }
+
+    def news_loader(ticker: str) -> list[str]:
+        with lock:
+            calls["news"] += 1
+        time.sleep(latency)
+        return [f"announces news item {i}" for i in range(5)]
+
+    return metrics_loader, news_loader, calls
+
+
+def run(n_requests: int, concurrency: int, tickers_per_request: int, latency: float) -> None:
+    metrics_loader, news_loader, calls = make_fakes(latency)
+    service = NewsletterService(metrics_loader=metrics_loader, news_loader=news_loader)
+    client = TestClient(create_app(service))
+
+    def request(i: int) -> int:
+        tickers = random.sample(TICKERS, tickers_per_request)
+        endpoint = "/preview" if i % 2 else "/metrics"
+        return client.get(endpoint, params={"tickers": ",".join(tickers)}).status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        statuses = list(executor.map(request, range(n_requests)))
+    elapsed = time.perf_counter() - start
+
+    errors = sum(status != 200 for status in statuses)
+    print(f"Requests:      {n_requests} ({concurrency} concurrent, {tickers_per_request} tickers each)")
+    print(f"Errors:        {errors}")
+    print(f"Elapsed:       {elapsed:.2f}s")
+    print(f"Throughput:    {n_requests / elapsed:.1f} requests/sec")
+    print(f"Loader calls:  metrics={calls['metrics']}, news={calls['news']} "
+          f"(without caching: {n_requests * tickers_per_request} each at most)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--tickers", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake loader latency (s)")
+    args = parser.parse_args()
+
+    run(args.requests, args.concurrency, args.tickers, args.latency)
@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 
 import dotenv
 
@@ -10,8 +11,25 @@ EMAIL_RECIPIENTS = os.getenv("EMAIL_RECIPIENTS")
 GMAIL_USER = os.getenv("GMAIL_USER")
 GMAIL_APP_PASSWORD = os.getenv("GMAIL_APP_PASSWORD")
 
+# Service mode: bearer token required by POST /send (endpoint disabled when unset)
+SERVICE_API_TOKEN = os.getenv("SERVICE_API_TOKEN")
+
 # HuggingFace Configuration
 HUGGINGFACE_TOKEN = os.getenv("HUGGINGFACE_TOKEN")
 
 # News Configuration
 USE_LLM_SUMMARIZATION = os.getenv("USE_LLM_SUMMARIZATION", "false").lower() == "true"
+
+# LLM budget per run: tickers with unusual moves are summarised first
+LLM_TOKEN_BUDGET = int(os.getenv("LLM_TOKEN_BUDGET", "50000"))
+LLM_TIME_BUDGET_SECONDS = float(os.getenv("LLM_TIME_BUDGET_SECONDS", "600"))
+LLM_PRIORITY_TICKERS = int(os.getenv("LLM_PRIORITY_TICKERS", "10"))
+
+# Days a news article is remembered so it is not summarised again
+NEWS_RETENTION_DAYS = int(os.getenv("NEWS_RETENTION_DAYS", "7"))
+
+# Job state (checkpoints of resumable runs)
+# On Cloud Run, point STATE_DIR to a mounted volume so retries can resume
+STATE_DIR = os.getenv("STATE_DIR", str(Path(__file__).parent / ".state"))
+# Defaults to the run date, so retries of the same nightly run share checkpoints
+RUN_ID = os.getenv("RUN_ID")
@@ -2,8 +2,18 @@
 
 import logging
 
-from config import EMAIL_RECIPIENTS, TICKERS
+from config import (
+    EMAIL_RECIPIENTS,
+    LLM_PRIORITY_TICKERS,
+    LLM_TIME_BUDGET_SECONDS,
+    LLM_TOKEN_BUDGET,
+    NEWS_RETENTION_DAYS,
+    RUN_ID,
+    STATE_DIR,
+    TICKERS,
+)
 from src import core
+from src.data.news.scheduler import SummaryBudget
 
 logging.basicConfig(level=logging.INFO)
 
@@ -27,7 +37,24 @@ if __name__ == "__main__":
     logging.info(f"Generating newsletter for tickers: {tickers_list}")
     logging.info(f"Sending to recipients: {recipients_list}")
 
-    result = core.generate_newsletter(tickers_list, recipients_list)
+    budget = SummaryBudget(
+        max_tokens=LLM_TOKEN_BUDGET,
+        max_seconds=LLM_TIME_BUDGET_SECONDS,
+        priority_count=LLM_PRIORITY_TICKERS,
+    )
+    try:
+        result = core.generate_newsletter(
+            tickers_list,
+            recipients_list,
+            run_id=RUN_ID,
+            state_dir=STATE_DIR,
+            budget=budget,
+            news_retention_days=NEWS_RETENTION_DAYS,
+        )
+    except core.DeliveryError as e:
+        # Non-zero exit so that the job is retried; delivered parts are not resent
+        logging.error(f"{e}. Exiting.")
+        exit(1)
 
     logging.info("Job finished successfully.")
     logging.info(f"Newsletter content generated: {len(result)} characters")
\ No newline at end of file
@@ -4,8 +4,9 @@ import logging
 import webbrowser
 from pathlib import Path
 
-from config import TICKERS
+from config import STATE_DIR, TICKERS
 from src.utils.email_formatter import create_newsletter_content
+from src.utils.sparkline import SparklineCache
 
 logging.basicConfig(level=logging.INFO)
 
@@ -23,8 +24,12 @@ if __name__ == "__main__":
 
     logging.info(f"Generating newsletter for tickers: {tickers_list}")
 
-    # Generate the newsletter content
-    html_content = create_newsletter_content(tickers_list)
+    # Generate the newsletter content, with SVG price sparklines (emails use text ones)
+    html_content = create_newsletter_content(
+        tickers_list,
+        include_sparklines=True,
+        sparkline_cache=SparklineCache(Path(STATE_DIR) / "sparklines"),
+    )
 
     # Save to file
     output_path = Path(__file__).parent / ".html"
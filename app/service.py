@@ -0,0 +1,215 @@
+"""Long-running service mode keeping the newsletter pipeline warm.
+
+Run from the app/ directory with:
+    uvicorn service:app --port 8080
+
+Endpoints:
+    GET  /health                          Liveness check
+    GET  /metrics?tickers=AAPL,MSFT       Metrics as JSON
+    GET  /preview?tickers=AAPL,MSFT       Newsletter preview as HTML
+    POST /send                            Render and send the newsletter
+                                          (requires SERVICE_API_TOKEN)
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import pandas as pd
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.responses import HTMLResponse
+from pydantic import BaseModel
+
+from config import EMAIL_RECIPIENTS, SERVICE_API_TOKEN, STATE_DIR, TICKERS
+from src import core
+from src.data import news_data
+from src.io.checkpoint import RunCheckpoint, default_run_id
+from src.utils import email_formatter, email_payload
+from src.utils.cache import SingleFlightCache
+from src.utils.sparkline import SparklineCache
+
+# Metrics record key of the text price sparkline (see sparkline_blocks)
+TREND_KEY = "60d Trend"
+
+logging.basicConfig(level=logging.INFO)
+
+
+class NewsletterService:
+    """Holds the warm summarizer and per-ticker caches shared by all requests."""
+
+    def __init__(
+        self,
+        metrics_loader: Callable[[str], dict] | None = None,
+        news_loader: Callable[[str], list[str]] | None = None,
+        ttl_seconds: float = 900.0,
+        max_workers: int = 16,
+        max_cached_tickers: int = 1024,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            metrics_loader (Callable[[str], dict]): Loads the metrics record of
+                one ticker (default: Yahoo Finance via extract_metrics, with its
+                text sparkline under TREND_KEY)
+            news_loader (Callable[[str], list[str]]): Loads the news bullets of
+                one ticker (default: fetch_news_data + summarize_news)
+            ttl_seconds (float): Freshness of cached metrics and news
+            max_workers (int): Number of tickers loaded in parallel
+            max_cached_tickers (int): Maximum number of tickers kept per cache
+        """
+        self.metrics_loader = metrics_loader or self._load_metrics
+        self.news_loader = news_loader or self._load_news
+        self.metrics_cache = SingleFlightCache(ttl_seconds, max_cached_tickers)
+        self.news_cache = SingleFlightCache(ttl_seconds, max_cached_tickers)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._summarizer = None
+        self._summarizer_lock = threading.Lock()
+
+    @property
+    def summarizer(self):
+        """NewsSummarizer created once and reused (None if unavailable)."""
+        with self._summarizer_lock:
+            if self._summarizer is None:
+                try:
+                    from src.data.news.llm_summariser import NewsSummarizer
+
+                    self._summarizer = NewsSummarizer()
+                except Exception as e:
+                    logging.error(f"Could not initialise NewsSummarizer: {e}")
+            return self._summarizer
+
+    def _load_metrics(self, ticker: str) -> dict:
+        # The record, sparkline included, is cached by metrics_cache
+        metrics_df, sparklines = email_formatter.fetch_metrics_and_sparklines(
+            [ticker], cache=SparklineCache(width=12, fmt="blocks")
+        )
+        record = json.loads(metrics_df.to_json(orient="records"))[0]
+        record[TREND_KEY] = sparklines.get(ticker, "")
+        return record
+
+    def _load_news(self, ticker: str) -> list[str]:
+        raw_news = news_data.fetch_news_data([ticker])
+        summaries = news_data.summarize_news([ticker], raw_news, summarizer=self.summarizer)
+        return summaries.get(ticker, [])
+
+    def _submit(self, cache: SingleFlightCache, loader: Callable, tickers: list[str]) -> list:
+        # Only leaf per-ticker loads run on the executor: a task waiting on other
+        # tasks of the same pool deadlocks once every worker is waiting
+        return [
+            self.executor.submit(cache.get, ticker, lambda t=ticker: loader(t))
+            for ticker in tickers
+        ]
+
+    def metrics(self, tickers: list[str]) -> list[dict]:
+        """Metrics records for the tickers, loaded in parallel and cached."""
+        futures = self._submit(self.metrics_cache, self.metrics_loader, tickers)
+        return [future.result() for future in futures]
+
+    def newsletter_data(self, tickers: list[str]) -> tuple[dict[str, list[str]], pd.DataFrame]:
+        """Same output as email_formatter.fetch_newsletter_data, served from the caches."""
+        news_futures = self._submit(self.news_cache, self.news_loader, tickers)
+        metrics_futures = self._submit(self.metrics_cache, self.metrics_loader, tickers)
+        news = {ticker: future.result() for ticker, future in zip(tickers, news_futures)}
+        metrics_df = pd.DataFrame([future.result() for future in metrics_futures])
+        return news, metrics_df
+
+
+class SendRequest(BaseModel):
+    tickers: list[str] | None = None
+    recipients: list[str] | None = None
+
+
+def _parse_tickers(tickers: str | None) -> list[str]:
+    tickers = tickers or TICKERS
+    if not tickers:
+        raise HTTPException(status_code=400, detail="No tickers provided")
+    tickers_list = [ticker.strip().upper() for ticker in tickers.split(",") if ticker.strip()]
+    if not tickers_list:
+        raise HTTPException(status_code=400, detail="No tickers provided")
+    return tickers_list
+
+
+def _split_sparklines(metrics_df: pd.DataFrame) -> tuple[pd.DataFrame, dict[str, str] | None]:
+    """Separate the text sparklines carried by the metrics records, if any."""
+    if TREND_KEY not in metrics_df.columns:
+        return metrics_df, None
+    sparklines = dict(zip(metrics_df["Ticker"], metrics_df[TREND_KEY].fillna("")))
+    return metrics_df.drop(columns=[TREND_KEY]), sparklines
+
+
+def _configured_recipients() -> list[str]:
+    return [recipient.strip() for recipient in (EMAIL_RECIPIENTS or "").split(",") if recipient.strip()]
+
+
+def _check_token(authorization: str | None) -> None:
+    """Only callers holding SERVICE_API_TOKEN may send emails."""
+    if not SERVICE_API_TOKEN:
+        raise HTTPException(status_code=403, detail="Sending is disabled: SERVICE_API_TOKEN is not set")
+    expected = f"Bearer {SERVICE_API_TOKEN}"
+    if not authorization or not hmac.compare_digest(authorization.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Invalid or missing bearer token")
+
+
+def create_app(service: NewsletterService | None = None) -> FastAPI:
+    """Create the FastAPI application around a (warm) NewsletterService."""
+    service = service or NewsletterService()
+    api = FastAPI(title="Portfolio Newsletter")
+    api.state.service = service
+
+    @api.get("/health")
+    def health() -> dict:
+        return {"status": "ok"}
+
+    @api.get("/metrics")
+    def metrics(tickers: str | None = Query(None, description="Comma-separated tickers")) -> list[dict]:
+        return service.metrics(_parse_tickers(tickers))
+
+    @api.get("/preview", response_class=HTMLResponse)
+    def preview(tickers: str | None = Query(None, description="Comma-separated tickers")) -> str:
+        tickers_list = _parse_tickers(tickers)
+        news, metrics_df = service.newsletter_data(tickers_list)
+        metrics_df, sparklines = _split_sparklines(metrics_df)
+        return email_formatter.render_newsletter(tickers_list, news, metrics_df, sparklines=sparklines)
+
+    @api.post("/send")
+    def send(request: SendRequest, authorization: str | None = Header(None)) -> dict:
+        _check_token(authorization)
+
+        tickers_list = _parse_tickers(",".join(request.tickers) if request.tickers else None)
+        allowed = {recipient.lower() for recipient in _configured_recipients()}
+        recipients = request.recipients or _configured_recipients()
+        if not recipients:
+            raise HTTPException(status_code=400, detail="No recipients provided")
+        unknown = [recipient for recipient in recipients if recipient.lower() not in allowed]
+        if unknown:
+            raise HTTPException(status_code=403, detail=f"Recipients not in EMAIL_RECIPIENTS: {unknown}")
+
+        news, metrics_df = service.newsletter_data(tickers_list)
+        metrics_df, sparklines = _split_sparklines(metrics_df)
+        payloads = email_payload.build_payloads(tickers_list, news, metrics_df, sparklines=sparklines)
+
+        # One delivery checkpoint per day and ticker list: repeated calls do not resend
+        tickers_key = hashlib.sha1(",".join(tickers_list).encode("utf-8")).hexdigest()[:8]
+        run_id = f"service-{default_run_id()}-{tickers_key}"
+        checkpoint = RunCheckpoint(run_id, STATE_DIR, fingerprint=",".join(tickers_list))
+        try:
+            core.deliver(checkpoint, payloads, recipients)
+        except core.DeliveryError as e:
+            raise HTTPException(status_code=502, detail=str(e))
+
+        return {
+            "run_id": run_id,
+            "recipients": recipients,
+            "parts": len(payloads),
+            "bytes": [email_payload.payload_size(payload) for payload in payloads],
+        }
+
+    return api
+
+
+app = create_app()
@@ -2,21 +2,155 @@
 Core module for the portfolio newsletter service.
 """
 
+import hashlib
+import json
 import logging
+from pathlib import Path
 
+import pandas as pd
+
+from src.data import news_data
+from src.data.news.article_ledger import ArticleLedger
 from src.io import email
-from src.utils import email_formatter
+from src.io.checkpoint import FAILED, PENDING, SENT, RunCheckpoint, default_run_id
+from src.utils import email_formatter, email_payload
+from src.utils.sparkline import SparklineCache
+
+
+def _message_id(run_id: str, recipient: str, part_index: int) -> str:
+    """Stable Message-ID so a resent email is recognised as the same message."""
+    digest = hashlib.sha1(recipient.lower().encode("utf-8")).hexdigest()[:16]
+    return f"<{run_id}.{part_index}.{digest}@portfolio-newsletter>"
+
+
+class DeliveryError(Exception):
+    """Raised when some recipients did not receive every part of the newsletter."""
+
+    def __init__(self, failed_keys: list[str]):
+        self.failed_keys = failed_keys
+        super().__init__(f"Newsletter not delivered for: {', '.join(failed_keys)}")
+
+
+def deliver(
+    checkpoint: RunCheckpoint,
+    payloads: list[dict[str, str]],
+    recipients: list[str],
+) -> None:
+    """
+    Send every payload to every recipient that has not received it yet.
+
+    Deliveries interrupted in a previous attempt (still pending) are resent
+    with the same Message-ID, so mail clients treat a possible duplicate as
+    the same message.
+
+    Raises:
+        DeliveryError: If some payloads could not be sent, once every other
+            delivery has been attempted
+    """
+    failed_keys = []
+    for recipient in recipients:
+        for part_index, payload in enumerate(payloads):
+            key = f"{recipient}|{part_index}"
+            status = checkpoint.delivery_status(key)
+
+            if status == SENT:
+                logging.info(f"Newsletter {payload['part_label'] or 'email'} already sent to {recipient}, skipping")
+                continue
+            if status == PENDING:
+                logging.warning(
+                    f"Delivery to {recipient} was interrupted in a previous attempt, "
+                    "resending with the same Message-ID"
+                )
+
+            checkpoint.set_delivery_status(key, PENDING)
+            try:
+                sent = email.send_email(
+                    payload["html"],
+                    [recipient],
+                    text_content=payload["text"],
+                    subject_suffix=payload["part_label"],
+                    message_id=_message_id(checkpoint.run_id, recipient, part_index),
+                )
+            except Exception:
+                checkpoint.set_delivery_status(key, FAILED)
+                raise
+
+            if not sent:
+                checkpoint.set_delivery_status(key, FAILED)
+                failed_keys.append(key)
+                continue
+
+            checkpoint.set_delivery_status(key, SENT)
+            logging.info(
+                f"Newsletter {payload['part_label'] or 'email'} sent to {recipient} "
+                f"({email_payload.payload_size(payload)} bytes)"
+            )
+
+    if failed_keys:
+        raise DeliveryError(failed_keys)
+
+
+def generate_newsletter(
+    tickers: list[str],
+    recipients: list[str],
+    run_id: str | None = None,
+    state_dir: str | Path | None = None,
+    budget=None,
+    news_retention_days: int = 7,
+) -> str:
+    """
+    Generate a newsletter for the given tickers and send it via email.
+
+    Every stage (metrics and sparklines, news fetch, summaries, render,
+    delivery) is checkpointed under the run ID, so rerunning with the same run
+    ID after a failure resumes from the last completed stage and only emails the
+    recipients that were not reached yet. News summaries spend the LLM
+    `budget` (a SummaryBudget) on the tickers with the most unusual moves first,
+    and only articles not summarised within the last `news_retention_days`
+    are sent to the LLM. Job state lives in `state_dir` (default:
+    config.STATE_DIR).
+
+    Raises:
+        DeliveryError: If some recipients could not be reached
+    """
+    if state_dir is None:
+        from config import STATE_DIR
+
+        state_dir = STATE_DIR
+    run_id = run_id or default_run_id()
+    checkpoint = RunCheckpoint(run_id, state_dir, fingerprint=",".join(tickers))
 
+    def fetch_market_data() -> dict:
+        # Text sparklines survive every mail client and reuse the metrics history
+        metrics_df, sparklines = email_formatter.fetch_metrics_and_sparklines(
+            tickers, cache=SparklineCache(Path(state_dir) / "sparklines", width=12, fmt="blocks")
+        )
+        return {"metrics": json.loads(metrics_df.to_json(orient="records")), "sparklines": sparklines}
 
-def generate_newsletter(tickers: list[str], recipients: list[str]) -> str:
-    """Generate a newsletter for the given tickers and send it via email."""
+    market_data = checkpoint.stage("market_data", fetch_market_data)
+    metrics_df = pd.DataFrame(market_data["metrics"])
 
-    newsletter_content = email_formatter.create_newsletter_content(tickers)
+    raw_news = checkpoint.stage("news", lambda: news_data.fetch_news_data(tickers))
+    summaries = checkpoint.stage(
+        "summaries",
+        lambda: news_data.summarize_news(
+            tickers,
+            raw_news,
+            metrics_df=metrics_df,
+            budget=budget,
+            ledger=ArticleLedger(Path(state_dir) / "news_ledger.json", news_retention_days),
+        ),
+    )
+    payloads = checkpoint.stage(
+        "render",
+        lambda: email_payload.build_payloads(
+            tickers, summaries, metrics_df, sparklines=market_data["sparklines"]
+        ),
+    )
 
     if recipients:
-        email.send_email(newsletter_content, recipients)
-        logging.info(f"Newsletter sent to {recipients}")
+        deliver(checkpoint, payloads, recipients)
     else:
         logging.warning("No recipients provided, newsletter not sent")
 
-    return newsletter_content
+    return "".join(payload["html"] for payload in payloads)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Persistent Article Ledger
+
+This module remembers, per ticker, which news articles were already
+summarised (by fingerprint) and the bullets they produced, so that each run
+only sends new articles to the LLM:
+- Tickers without new articles reuse their prior bullets and skip the LLM
+- Fresh bullets are merged with the still-relevant prior ones
+- Articles and bullets older than the retention window are forgotten
+
+Articles are given either as a list (of strings, or dicts with an 'id', 'url'
+or 'title'/'text') or as a raw text blob, which is split into sentences.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Union
+
+from src.utils.text import split_sentences
+
+Article = Union[str, Dict[str, str]]
+
+
+def split_articles(raw_info: Union[str, List[Article]]) -> List[Article]:
+    """Split raw news into the units tracked by the ledger."""
+    if isinstance(raw_info, list):
+        return [article for article in raw_info if article]
+    return split_sentences(raw_info)
+
+
+def article_text(article: Article) -> str:
+    """Text of an article as sent to the LLM."""
+    if isinstance(article, dict):
+        return ". ".join(part for part in (article.get("title", ""), article.get("text", "")) if part)
+    return article
+
+
+def fingerprint(article: Article) -> str:
+    """Stable fingerprint of an article, insensitive to case and punctuation."""
+    if isinstance(article, dict) and (article.get("id") or article.get("url")):
+        identity = article.get("id") or article.get("url")
+    else:
+        identity = " ".join(re.findall(r"\w+", article_text(article).lower()))
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()[:16]
+
+
+def merge_bullets(fresh: List[str], prior: List[str], max_bullets: int = 5) -> List[str]:
+    """Fresh bullets first, then prior ones not already covered, capped at max_bullets."""
+    merged, seen = [], set()
+    for bullet in fresh + prior:
+        key = " ".join(bullet.lower().split())
+        if key not in seen:
+            seen.add(key)
+            merged.append(bullet)
+    return merged[:max_bullets]
+
+
+class ArticleLedger:
+    """Per-ticker record of summarised articles and their bullets, stored as JSON."""
+
+    def __init__(self, path: Union[str, Path], retention_days: int = 7, today: date = None):
+        """
+        Initialize the ledger.
+
+        Args:
+            path (str | Path): JSON file persisting the ledger
+            retention_days (int): Days an article/bullet is remembered
+            today (date): Date of the run (default: today)
+        """
+        self.path = Path(path)
+        self.retention_days = retention_days
+        self.today = today or date.today()
+        self.data: Dict[str, Dict] = {}
+
+        if self.path.exists():
+            try:
+                with open(self.path, "r") as f:
+                    self.data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logging.warning(f"Ignoring unreadable article ledger {self.path}: {e}")
+        self._prune()
+
+    def _prune(self) -> None:
+        cutoff = (self.today - timedelta(days=self.retention_days)).isoformat()
+        for ticker, entry in list(self.data.items()):
+            entry["articles"] = {fp: seen for fp, seen in entry.get("articles", {}).items() if seen >= cutoff}
+            entry["bullets"] = [b for b in entry.get("bullets", []) if b["date"] >= cutoff]
+            # Tickers that left the watchlist are forgotten with their last articles
+            if not entry["articles"] and not entry["bullets"]:
+                del self.data[ticker]
+
+    def new_articles(self, ticker: str, articles: List[Article]) -> List[Article]:
+        """Articles of a ticker not summarised within the retention window."""
+        seen = self.data.get(ticker, {}).get("articles", {})
+        return [article for article in articles if fingerprint(article) not in seen]
+
+    def prior_bullets(self, ticker: str) -> List[str]:
+        """Still-relevant bullets of previous runs, most recent first."""
+        bullets = self.data.get(ticker, {}).get("bullets", [])
+        return [b["text"] for b in sorted(bullets, key=lambda b: b["date"], reverse=True)]
+
+    def record(self, ticker: str, articles: List[Article], bullets: List[str]) -> None:
+        """Mark articles as summarised today and store the bullets they produced."""
+        entry = self.data.setdefault(ticker, {"articles": {}, "bullets": []})
+        today = self.today.isoformat()
+        for article in articles:
+            entry["articles"].setdefault(fingerprint(article), today)
+        # Re-reported bullets are kept once, with the latest date
+        fresh = {b.lower() for b in bullets}
+        entry["bullets"] = [b for b in entry["bullets"] if b["text"].lower() not in fresh]
+        entry["bullets"] += [{"text": b, "date": today} for b in bullets]
+
+    def save(self) -> None:
+        """Persist the ledger (written then renamed to never leave a partial file)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.data, f)
+        os.replace(tmp_path, self.path)
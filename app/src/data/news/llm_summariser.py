@@ -18,6 +18,19 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Prompt and completion size per level of detail
+DETAIL_LEVELS = {
+    "rich": {"max_bullets": 5, "max_tokens": 700},
+    "standard": {"max_bullets": 5, "max_tokens": 500},
+    "short": {"max_bullets": 2, "max_tokens": 150},
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
 class NewsSummarizer:
     """Summarizes raw news data using HuggingFace LLMs with structured output."""
 
@@ -38,6 +51,69 @@ class NewsSummarizer:
         with open(template_path, "r") as f:
             self.template = Template(f.read())
 
+    def build_prompt(self, ticker: str, data: Dict[str, str], detail: str = "standard", signal: str = "") -> str:
+        """
+        Render the summarisation prompt for a ticker.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            data (Dict[str, str]): News data with keys company_name and raw_info
+            detail (str): Level of detail, one of DETAIL_LEVELS
+            signal (str): Optional market context (e.g. unusual volume) to explain
+
+        Returns:
+            str: The prompt sent to the LLM
+        """
+        return self.template.render(
+            company_name=data.get("company_name", ticker),
+            raw_info=data.get("raw_info", ""),
+            max_bullets=DETAIL_LEVELS[detail]["max_bullets"],
+            signal=signal,
+        )
+
+    def summarize(self, ticker: str, data: Dict[str, str], detail: str = "standard", signal: str = "") -> List[str]:
+        """
+        Summarize the news of a single ticker.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            data (Dict[str, str]): News data with keys company_name and raw_info
+            detail (str): Level of detail, one of DETAIL_LEVELS
+            signal (str): Optional market context (e.g. unusual volume) to explain
+
+        Returns:
+            List[str]: Bullet points (empty if no news or on error)
+        """
+        if not data.get("raw_info", ""):
+            return []
+
+        # Generate prompt from template
+        prompt = self.build_prompt(ticker, data, detail=detail, signal=signal)
+
+        try:
+            # Call LLM
+            response = self.client.chat.completions.create(
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=DETAIL_LEVELS[detail]["max_tokens"],
+                temperature=0.3,
+            )
+
+            # Parse JSON response
+            summary_text = response.choices[0].message.content.strip()
+            summary_json = json.loads(summary_text)
+
+            # Handle both dict and list responses
+            if isinstance(summary_json, dict):
+                return summary_json.get("bullets", [])
+            elif isinstance(summary_json, list):
+                return summary_json
+            else:
+                return []
+
+        except Exception as e:
+            print(f"Error summarizing {ticker}: {e}")
+            return []
+
     def summarize_batch(self, news_data: Dict[str, Dict[str, str]]) -> Dict[str, List[str]]:
         """
         Summarize news for multiple tickers.
@@ -50,44 +126,7 @@ class NewsSummarizer:
         Returns:
             Dict[str, List[str]]: Dictionary mapping ticker to list of bullet points
         """
-        results = {}
-
-        for ticker, data in news_data.items():
-            company_name = data.get("company_name", ticker)
-            raw_info = data.get("raw_info", "")
-
-            if not raw_info:
-                results[ticker] = []
-                continue
-
-            # Generate prompt from template
-            prompt = self.template.render(company_name=company_name, raw_info=raw_info)
-
-            try:
-                # Call LLM
-                response = self.client.chat.completions.create(
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=500,
-                    temperature=0.3,
-                )
-
-                # Parse JSON response
-                summary_text = response.choices[0].message.content.strip()
-                summary_json = json.loads(summary_text)
-
-                # Handle both dict and list responses
-                if isinstance(summary_json, dict):
-                    results[ticker] = summary_json.get("bullets", [])
-                elif isinstance(summary_json, list):
-                    results[ticker] = summary_json
-                else:
-                    results[ticker] = []
-
-            except Exception as e:
-                print(f"Error summarizing {ticker}: {e}")
-                results[ticker] = []
-
-        return results
+        return {ticker: self.summarize(ticker, data) for ticker, data in news_data.items()}
 
 
 # Example usage
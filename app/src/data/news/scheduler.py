@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Signal-driven LLM Budget Scheduler
+
+This module ranks tickers by how unusual their recent trading is and spends
+a bounded LLM token/time budget on the most unusual ones first:
+- Top-ranked tickers get a rich prompt including their market signal
+- The others get a short prompt while the budget lasts
+- Once the budget is spent, an extractive summary (first headlines) is used
+  without any LLM call
+
+Anomaly score: robust z-scores (median / MAD across the watchlist) of
+log(Volume Ratio (10d)) and Momentum (10d %); the score is the largest
+absolute z-score of the two.
+"""
+import logging
+import time
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.utils.text import split_sentences
+
+
+class SummaryBudget:
+    """Token and time budget for the LLM summaries of a single run."""
+
+    def __init__(self, max_tokens: int = 50_000, max_seconds: float = 600.0, priority_count: int = 10):
+        """
+        Initialize the budget.
+
+        Args:
+            max_tokens (int): Estimated prompt + completion tokens allowed
+            max_seconds (float): Wall-clock time allowed for LLM calls
+            priority_count (int): Number of top-ranked tickers getting rich prompts
+        """
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+        self.priority_count = priority_count
+        self.tokens_used = 0
+        self.seconds_used = 0.0
+
+    def can_afford(self, tokens: int) -> bool:
+        return self.tokens_used + tokens <= self.max_tokens and self.seconds_used < self.max_seconds
+
+    def spend(self, tokens: int, seconds: float) -> None:
+        self.tokens_used += tokens
+        self.seconds_used += seconds
+
+
+def _robust_zscores(values: pd.Series) -> pd.Series:
+    """Robust z-scores using the median and the median absolute deviation."""
+    median = values.median()
+    mad = (values - median).abs().median() * 1.4826
+    if not mad or np.isnan(mad):
+        mad = values.std()
+    if not mad or np.isnan(mad):
+        return pd.Series(0.0, index=values.index)
+    return (values - median) / mad
+
+
+def anomaly_scores(metrics_df: pd.DataFrame) -> pd.Series:
+    """
+    Score how unusual each ticker's recent volume and momentum are.
+
+    Args:
+        metrics_df (pd.DataFrame): Output of extract_metrics
+
+    Returns:
+        pd.Series: Anomaly score indexed by ticker, sorted descending
+            (missing metrics count as not unusual)
+    """
+    if metrics_df.empty:
+        return pd.Series(dtype=float)
+
+    metrics = metrics_df.set_index("Ticker")
+    volume = pd.to_numeric(metrics["Volume Ratio (10d)"], errors="coerce")
+    momentum = pd.to_numeric(metrics["Momentum (10d %)"], errors="coerce")
+
+    z_volume = _robust_zscores(np.log(volume.where(volume > 0)))
+    z_momentum = _robust_zscores(momentum)
+
+    scores = pd.concat([z_volume.abs(), z_momentum.abs()], axis=1).max(axis=1).fillna(0.0)
+    return scores.sort_values(ascending=False, kind="stable")
+
+
+def describe_signal(metrics: pd.Series) -> str:
+    """Human readable market signal of a ticker for the rich prompt."""
+    parts = []
+    if pd.notna(metrics.get("Volume Ratio (10d)")):
+        parts.append(f"trading volume is {metrics['Volume Ratio (10d)']:.2f}x its 10-day average")
+    if pd.notna(metrics.get("Momentum (10d %)")):
+        parts.append(f"price moved {metrics['Momentum (10d %)']:+.2f}% over the last 10 days")
+    return "; ".join(parts)
+
+
+def extractive_summary(raw_info: str, max_bullets: int = 2) -> List[str]:
+    """Cheap summary without LLM: the first sentences (headlines) of the raw news, as written."""
+    return [sentence.rstrip(".!? ") for sentence in split_sentences(raw_info)[:max_bullets]]
+
+
+def summarize_prioritised(
+    news_data: Dict[str, Dict[str, str]],
+    metrics_df: pd.DataFrame,
+    summarizer,
+    budget: SummaryBudget,
+    return_tiers: bool = False,
+) -> Union[Dict[str, List[str]], Tuple[Dict[str, List[str]], Dict[str, str]]]:
+    """
+    Summarize news spending the LLM budget on the most unusual tickers first.
+
+    Args:
+        news_data (Dict[str, Dict[str, str]]): Ticker to dict with company_name and raw_info
+        metrics_df (pd.DataFrame): Output of extract_metrics, used for ranking
+        summarizer (NewsSummarizer): Summarizer performing the LLM calls
+        budget (SummaryBudget): Token/time budget, updated as it is spent
+        return_tiers (bool): Also return the tier used for each ticker
+
+    Returns:
+        Dict[str, List[str]]: Dictionary mapping ticker to list of bullet points,
+        and when return_tiers is True a second dictionary mapping each ticker
+        with news to its tier ('rich', 'short' or 'extractive')
+    """
+    from src.data.news.llm_summariser import DETAIL_LEVELS, estimate_tokens
+
+    scores = anomaly_scores(metrics_df)
+    ranked = [ticker for ticker in scores.index if ticker in news_data]
+    ranked += [ticker for ticker in news_data if ticker not in scores.index]
+    metrics = metrics_df.set_index("Ticker") if not metrics_df.empty else pd.DataFrame()
+
+    results = {}
+    tiers = {}
+    for rank, ticker in enumerate(ranked):
+        data = news_data[ticker]
+        if not data.get("raw_info", ""):
+            results[ticker] = []
+            continue
+
+        detail = "rich" if rank < budget.priority_count else "short"
+        signal = describe_signal(metrics.loc[ticker]) if detail == "rich" and ticker in metrics.index else ""
+        prompt = summarizer.build_prompt(ticker, data, detail=detail, signal=signal)
+        cost = estimate_tokens(prompt) + DETAIL_LEVELS[detail]["max_tokens"]
+
+        if not budget.can_afford(cost):
+            results[ticker] = extractive_summary(data["raw_info"])
+            tiers[ticker] = "extractive"
+            continue
+
+        start = time.monotonic()
+        results[ticker] = summarizer.summarize(ticker, data, detail=detail, signal=signal)
+        budget.spend(cost, time.monotonic() - start)
+        tiers[ticker] = detail
+
+    counts = {tier: list(tiers.values()).count(tier) for tier in ("rich", "short", "extractive")}
+    logging.info(
+        f"LLM budget: {budget.tokens_used}/{budget.max_tokens} tokens, "
+        f"{budget.seconds_used:.1f}/{budget.max_seconds:.0f}s; "
+        f"summaries rich={counts['rich']}, short={counts['short']}, extractive={counts['extractive']}"
+    )
+    return (results, tiers) if return_tiers else results
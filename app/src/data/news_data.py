@@ -9,9 +9,11 @@ Author: Clément Van Goethem
 Date: 2025-10-04
 """
 import json
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pathlib import Path
 
+import pandas as pd
+
 # TODO: remove dummy data below
 def get_news_placeholder(ticker: str) -> List[str]:
     """
@@ -47,16 +49,50 @@ def load_input_news_data() -> Dict[str, Dict[str, str]]:
         return {}
 
 
-def get_all_news(tickers: List[str], use_llm: bool = True) -> Dict[str, List[str]]:
+def fetch_news_data(tickers: List[str]) -> Dict[str, Dict[str, str]]:
     """
-    Get news for multiple tickers.
+    Fetch raw news data for the requested tickers.
 
-    When use_llm=True, uses LLM summarization with real news data from input_news_summary.json.
-    When use_llm=False, returns placeholder data.
+    Args:
+        tickers (List[str]): List of stock ticker symbols
+
+    Returns:
+        Dict[str, Dict[str, str]]: Dictionary mapping ticker to news data,
+        only for tickers with available news
+    """
+    all_news_data = load_input_news_data()
+    return {
+        ticker: all_news_data[ticker]
+        for ticker in tickers
+        if ticker in all_news_data
+    }
+
+
+def summarize_news(
+    tickers: List[str],
+    news_data: Dict[str, Dict[str, str]],
+    use_llm: bool = True,
+    summarizer=None,
+    metrics_df: Optional[pd.DataFrame] = None,
+    budget=None,
+    ledger=None,
+) -> Dict[str, List[str]]:
+    """
+    Summarize already fetched raw news into bullet points.
 
     Args:
         tickers (List[str]): List of stock ticker symbols
-        use_llm (bool): Whether to use LLM summarization (default: False)
+        news_data (Dict[str, Dict[str, str]]): Output of fetch_news_data
+        use_llm (bool): Whether to use LLM summarization (default: True)
+        summarizer (NewsSummarizer): Existing summarizer to reuse; a new one
+            is created when not provided
+        metrics_df (pd.DataFrame): Output of extract_metrics; when provided,
+            the LLM budget is spent on the tickers with unusual moves first
+        budget (SummaryBudget): LLM token/time budget used with metrics_df
+            (default: SummaryBudget())
+        ledger (ArticleLedger): Articles already summarised in previous runs;
+            when provided, only new articles are summarised and merged with
+            the prior bullets, and tickers without new articles skip the LLM
 
     Returns:
         Dict[str, List[str]]: Dictionary mapping ticker to list of news bullet points
@@ -65,29 +101,111 @@ def get_all_news(tickers: List[str], use_llm: bool = True) -> Dict[str, List[str
         # Return placeholder data
         return {ticker: get_news_placeholder(ticker) for ticker in tickers}
 
-    # Use LLM summarization with input data
     try:
-        from src.data.news.llm_summariser import NewsSummarizer
-
-        # Load news data from input JSON
-        all_news_data = load_input_news_data()
-
-        # Filter to requested tickers
-        news_data = {
-            ticker: all_news_data[ticker]
-            for ticker in tickers
-            if ticker in all_news_data
-        }
-
         if not news_data:
             print(f"No news data found for tickers: {tickers}")
             print("Falling back to placeholder data")
             return {ticker: get_news_placeholder(ticker) for ticker in tickers}
 
-        summarizer = NewsSummarizer()
-        return summarizer.summarize_batch(news_data)
+        if ledger is not None:
+            return _summarize_incremental(news_data, ledger, summarizer, metrics_df, budget)
+
+        return _summarize_llm(news_data, summarizer, metrics_df, budget)
 
     except Exception as e:
         print(f"Error using LLM summarization: {e}")
         print("Falling back to placeholder data")
         return {ticker: get_news_placeholder(ticker) for ticker in tickers}
+
+
+def _summarize_llm(
+    news_data: Dict[str, Dict[str, str]],
+    summarizer=None,
+    metrics_df: Optional[pd.DataFrame] = None,
+    budget=None,
+    return_tiers: bool = False,
+):
+    """
+    Summarize with the LLM, within the budget when metrics are available.
+
+    With return_tiers, also returns the tier used per ticker ('standard' for
+    batch summaries, else see summarize_prioritised).
+    """
+    from src.data.news.llm_summariser import NewsSummarizer
+
+    summarizer = summarizer or NewsSummarizer()
+    if metrics_df is None:
+        results = summarizer.summarize_batch(news_data)
+        if return_tiers:
+            return results, {ticker: "standard" for ticker in results}
+        return results
+
+    from src.data.news.scheduler import SummaryBudget, summarize_prioritised
+
+    return summarize_prioritised(
+        news_data, metrics_df, summarizer, budget or SummaryBudget(), return_tiers=return_tiers
+    )
+
+
+def _summarize_incremental(
+    news_data: Dict[str, Dict[str, str]],
+    ledger,
+    summarizer=None,
+    metrics_df: Optional[pd.DataFrame] = None,
+    budget=None,
+) -> Dict[str, List[str]]:
+    """Summarize only the articles missing from the ledger, then merge with prior bullets."""
+    from src.data.news.article_ledger import article_text, merge_bullets, split_articles
+
+    articles = {ticker: split_articles(data.get("raw_info", "")) for ticker, data in news_data.items()}
+    new_articles = {ticker: ledger.new_articles(ticker, items) for ticker, items in articles.items()}
+    to_summarize = {
+        ticker: {**news_data[ticker], "raw_info": " ".join(article_text(a) for a in items)}
+        for ticker, items in new_articles.items()
+        if items
+    }
+    print(
+        f"News ledger: {sum(len(items) for items in new_articles.values())} new articles "
+        f"out of {sum(len(items) for items in articles.values())}, "
+        f"{len(news_data) - len(to_summarize)} tickers without new articles"
+    )
+
+    fresh, tiers = {}, {}
+    if to_summarize:
+        fresh, tiers = _summarize_llm(to_summarize, summarizer, metrics_df, budget, return_tiers=True)
+
+    results = {}
+    for ticker in news_data:
+        results[ticker] = merge_bullets(fresh.get(ticker, []), ledger.prior_bullets(ticker))
+        # Only LLM summaries are recorded: articles that fell back to extractive
+        # bullets (budget exhausted) or got none (LLM error) are retried next run
+        if fresh.get(ticker) and tiers.get(ticker, "extractive") != "extractive":
+            ledger.record(ticker, new_articles[ticker], fresh[ticker])
+    ledger.save()
+    return results
+
+
+def get_all_news(
+    tickers: List[str],
+    use_llm: bool = True,
+    metrics_df: Optional[pd.DataFrame] = None,
+    budget=None,
+) -> Dict[str, List[str]]:
+    """
+    Get news for multiple tickers.
+
+    When use_llm=True, uses LLM summarization with real news data from input_news_summary.json.
+    When use_llm=False, returns placeholder data.
+
+    Args:
+        tickers (List[str]): List of stock ticker symbols
+        use_llm (bool): Whether to use LLM summarization (default: False)
+        metrics_df (pd.DataFrame): Output of extract_metrics, used to prioritise
+            tickers with unusual moves within the LLM budget
+        budget (SummaryBudget): LLM token/time budget
+
+    Returns:
+        Dict[str, List[str]]: Dictionary mapping ticker to list of news bullet points
+    """
+    news_data = fetch_news_data(tickers) if use_llm else {}
+    return summarize_news(tickers, news_data, use_llm=use_llm, metrics_df=metrics_df, budget=budget)
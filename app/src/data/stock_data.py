@@ -25,9 +25,11 @@ Usage:
 Author: Clément Van Goethem
 Date: 2025-10-04
 """
+import logging
+
 import yfinance as yf
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 def calculate_volatility(ticker: str, days: int = 10) -> float:
     """
@@ -69,11 +71,11 @@ def calculate_volatility(ticker: str, days: int = 10) -> float:
         volatility = ((high - low) / low) * 100
         return round(volatility, 2)
     except Exception as e:
-        print(f"Error calculating volatility for {ticker}: {e}")
+        logging.error(f"Error calculating volatility for {ticker}: {e}")
         return None
 
 
-def calculate_sma_50_ratio(ticker: str) -> float:
+def calculate_sma_50_ratio(ticker: str, hist: pd.DataFrame = None) -> float:
     """
     Calculate ratio of current price to 50-day simple moving average
     Formula: current_price / sma_50
@@ -89,6 +91,7 @@ def calculate_sma_50_ratio(ticker: str) -> float:
 
     Args:
         ticker (str): Stock ticker symbol (e.g., 'AAPL', 'MSFT')
+        hist (pd.DataFrame): Already fetched "60d" history of the ticker (fetched if None)
 
     Returns:
         float: Ratio of current price to 50-day SMA rounded to 2 decimals, or None if insufficient data
@@ -97,8 +100,9 @@ def calculate_sma_50_ratio(ticker: str) -> float:
         - Ratio = 1.0: Current price equals the 50-day SMA
     """
     try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period="60d")  # Get a bit more to ensure 50 days
+        if hist is None:
+            stock = yf.Ticker(ticker)
+            hist = stock.history(period="60d")  # Get a bit more to ensure 50 days
 
         if len(hist) < 50:
             return None
@@ -108,7 +112,7 @@ def calculate_sma_50_ratio(ticker: str) -> float:
         ratio = current_price / sma_50
         return round(ratio, 2)
     except Exception as e:
-        print(f"Error calculating SMA ratio for {ticker}: {e}")
+        logging.error(f"Error calculating SMA ratio for {ticker}: {e}")
         return None
 
 
@@ -148,7 +152,7 @@ def calculate_momentum(ticker: str, days: int = 10) -> float:
         momentum = ((current_price - past_price) / past_price) * 100
         return round(momentum, 2)
     except Exception as e:
-        print(f"Error calculating momentum for {ticker}: {e}")
+        logging.error(f"Error calculating momentum for {ticker}: {e}")
         return None
 
 
@@ -191,7 +195,7 @@ def calculate_volume_ratio(ticker: str, days: int = 10) -> float:
         volume_ratio = current_volume / avg_volume
         return round(volume_ratio, 2)
     except Exception as e:
-        print(f"Error calculating volume ratio for {ticker}: {e}")
+        logging.error(f"Error calculating volume ratio for {ticker}: {e}")
         return None
 
 
@@ -215,15 +219,44 @@ def extract_metrics(tickers: List[str]) -> pd.DataFrame:
 
         Note: None values indicate data unavailability or errors for that metric/ticker
     """
+    df, _ = extract_metrics_with_closes(tickers)
+    return df
+
+
+def extract_metrics_with_closes(tickers: List[str]) -> Tuple[pd.DataFrame, Dict[str, pd.Series]]:
+    """
+    Extract all four metrics and the 60-day closing prices for a list of tickers
+
+    The closing prices come from the "60d" history already fetched for the
+    SMA ratio, so e.g. a price sparkline costs no extra Yahoo Finance call.
+
+    Args:
+        tickers (List[str]): List of stock ticker symbols (e.g., ['AAPL', 'GOOGL', 'MSFT'])
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, pd.Series]]:
+            - DataFrame of metrics (see `extract_metrics`)
+            - Dictionary mapping ticker to closing prices indexed by trading
+              date (oldest first), only for tickers with available data
+    """
     results = []
+    closes = {}
 
     for ticker in tickers:
-        print(f"Processing {ticker}...")
+        logging.debug(f"Processing {ticker}...")
+
+        try:
+            hist = yf.Ticker(ticker).history(period="60d")
+        except Exception as e:
+            logging.error(f"Error fetching history for {ticker}: {e}")
+            hist = pd.DataFrame()
+        if not hist.empty:
+            closes[ticker] = hist['Close']
 
         metrics = {
             'Ticker': ticker,
             'Volatility (10d %)': calculate_volatility(ticker),
-            'SMA 50d Ratio': calculate_sma_50_ratio(ticker),
+            'SMA 50d Ratio': calculate_sma_50_ratio(ticker, hist),
             'Momentum (10d %)': calculate_momentum(ticker),
             'Volume Ratio (10d)': calculate_volume_ratio(ticker)
         }
@@ -231,7 +264,7 @@ def extract_metrics(tickers: List[str]) -> pd.DataFrame:
         results.append(metrics)
 
     df = pd.DataFrame(results)
-    return df
+    return df, closes
 
 
 def metrics_to_markdown(df: pd.DataFrame) -> str:
@@ -0,0 +1,110 @@
+"""
+Checkpoint storage for resumable newsletter job runs.
+
+Each run is identified by a run ID (the run date by default). Stage outputs
+are stored as JSON files under `<state_dir>/runs/<run_id>/`, so a retried
+job reuses the completed stages instead of refetching and resummarising.
+Deliveries are tracked per recipient to guarantee no double sends.
+"""
+import json
+import logging
+import os
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable
+
+# Delivery states
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+
+def default_run_id() -> str:
+    """Run ID used when none is provided: today's date (YYYY-MM-DD)."""
+    return date.today().isoformat()
+
+
+class RunCheckpoint:
+    """Persists stage outputs and delivery status of a single job run."""
+
+    def __init__(self, run_id: str, state_dir: str | Path, fingerprint: str = ""):
+        """
+        Initialize the checkpoint store for a run.
+
+        Args:
+            run_id (str): Identifier of the run (e.g. '2025-10-04')
+            state_dir (str | Path): Base directory for persisted job state
+            fingerprint (str): Run inputs (e.g. tickers); stored stages are
+                discarded when a restarted run has a different fingerprint
+        """
+        self.run_id = run_id
+        self.run_dir = Path(state_dir) / "runs" / run_id
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = self._read("manifest")
+        if manifest is not None and manifest.get("fingerprint") != fingerprint:
+            logging.warning(f"Inputs of run {run_id} changed, discarding its checkpoints")
+            for path in self.run_dir.glob("*.json"):
+                if path.stem != "deliveries":
+                    path.unlink()
+        self._write("manifest", {"run_id": run_id, "fingerprint": fingerprint})
+
+    def _path(self, name: str) -> Path:
+        return self.run_dir / f"{name}.json"
+
+    def _read(self, name: str) -> Any:
+        path = self._path(name)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logging.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return None
+
+    def _write(self, name: str, data: Any) -> None:
+        # Write then rename so a crash never leaves a truncated checkpoint
+        path = self._path(name)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def load(self, stage: str) -> Any:
+        """Return the stored output of a stage, or None if not completed."""
+        return self._read(f"stage_{stage}")
+
+    def save(self, stage: str, data: Any) -> None:
+        """Store the output of a completed stage (must be JSON serialisable)."""
+        self._write(f"stage_{stage}", data)
+
+    def stage(self, stage: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return the stored output of a stage, computing and storing it if missing.
+
+        Args:
+            stage (str): Stage name (e.g. 'metrics', 'summaries')
+            compute (Callable[[], Any]): Produces the JSON serialisable stage output
+
+        Returns:
+            Any: The stage output
+        """
+        data = self.load(stage)
+        if data is not None:
+            logging.info(f"Run {self.run_id}: reusing checkpointed stage '{stage}'")
+            return data
+        data = compute()
+        self.save(stage, data)
+        logging.info(f"Run {self.run_id}: stage '{stage}' completed and checkpointed")
+        return data
+
+    def delivery_status(self, key: str) -> str | None:
+        """Delivery state ('pending', 'sent', 'failed') of a recipient/part key."""
+        return (self._read("deliveries") or {}).get(key)
+
+    def set_delivery_status(self, key: str, status: str) -> None:
+        """Record the delivery state of a recipient/part key."""
+        deliveries = self._read("deliveries") or {}
+        deliveries[key] = status
+        self._write("deliveries", deliveries)
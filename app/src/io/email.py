@@ -2,12 +2,48 @@ import logging
 import os
 import smtplib
 import ssl
+from email.charset import QP, Charset
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
+SUBJECT = "Portfolio Newsletter - Daily Update"
 
-def send_email(content: str, recipients: list[str]) -> None:
-    """Send email using Gmail SMTP."""
+# SMTP limit on the length of a line of a 7bit body
+MAX_LINE_LENGTH = 998
+
+
+def mime_part(content: str, subtype: str) -> MIMEText:
+    """
+    MIME part of the email, sent 7bit when possible.
+
+    Content with non-ASCII characters or overlong lines is sent as
+    quoted-printable UTF-8 rather than base64, which grows it by a third.
+    """
+    if content.isascii() and all(len(line) <= MAX_LINE_LENGTH for line in content.splitlines()):
+        return MIMEText(content, subtype, "us-ascii")
+    charset = Charset("utf-8")
+    charset.body_encoding = QP
+    return MIMEText(content, subtype, charset)
+
+
+def encoded_size(content: str, subtype: str) -> int:
+    """Size in bytes of a part once MIME encoded, as it goes over the wire."""
+    return len(mime_part(content, subtype).as_bytes())
+
+
+def send_email(
+    content: str,
+    recipients: list[str],
+    text_content: str | None = None,
+    subject_suffix: str = "",
+    message_id: str | None = None,
+) -> bool:
+    """
+    Send email using Gmail SMTP, with an optional plain-text alternative.
+
+    A stable `message_id` lets mail clients deduplicate a resent message.
+    Returns True when the email was handed over to the SMTP server.
+    """
 
     gmail_user = os.getenv("GMAIL_USER")
     gmail_app_password = os.getenv("GMAIL_APP_PASSWORD")
@@ -16,22 +52,37 @@ def send_email(content: str, recipients: list[str]) -> None:
         logging.error(
             "Gmail credentials not configured. Set GMAIL_USER and GMAIL_APP_PASSWORD environment variables."
         )
-        return
+        return False
 
     msg = MIMEMultipart("alternative")
-    msg["Subject"] = "Portfolio Newsletter - Daily Update"
+    # Assigning a header twice adds a second one, so build the subject first
+    msg["Subject"] = f"{SUBJECT} ({subject_suffix})" if subject_suffix else SUBJECT
     msg["From"] = gmail_user
     msg["To"] = ", ".join(recipients)
+    if message_id:
+        msg["Message-ID"] = message_id
 
-    html_part = MIMEText(content, "html")
+    # Parts are ordered by preference: clients render the last one they support
+    if text_content:
+        msg.attach(mime_part(text_content, "plain"))
+    html_part = mime_part(content, "html")
     msg.attach(html_part)
 
+    message = msg.as_string()
+    logging.info(
+        f"Email payload size: {len(message.encode('utf-8'))} bytes "
+        f"(html: {encoded_size(content, 'html')} bytes, "
+        f"text: {encoded_size(text_content, 'plain') if text_content else 0} bytes, encoded)"
+    )
+
     try:
         context = ssl.create_default_context()
 
         with smtplib.SMTP_SSL("smtp.gmail.com", 465, context=context) as server:
             server.login(gmail_user, gmail_app_password)
-            server.sendmail(gmail_user, recipients, msg.as_string())
+            server.sendmail(gmail_user, recipients, message)
+
+        return True
 
     except Exception as e:
         logging.error(f"Failed to send email: {e}")
@@ -0,0 +1,96 @@
+"""
+In-memory caching utilities for the long-running service mode.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlightCache:
+    """
+    Thread-safe TTL cache where concurrent misses for the same key share one load.
+
+    The first caller of a missing key runs the loader; callers arriving while
+    that load is in flight wait for its result instead of loading again.
+    Failed loads are not cached. At most `max_entries` values are kept: expired
+    entries are dropped first, then the least recently used ones.
+    """
+
+    def __init__(self, ttl_seconds: float = 900.0, max_entries: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds (float): How long a loaded value stays fresh
+            max_entries (int): Maximum number of cached values
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._values: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self.loads = 0
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, loading it if missing or expired.
+
+        Args:
+            key (Hashable): Cache key (e.g. a ticker)
+            loader (Callable[[], Any]): Computes the value on a miss
+
+        Returns:
+            Any: The cached or freshly loaded value
+        """
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl_seconds:
+                self._values.move_to_end(key)
+                return entry[1]
+
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._in_flight[key] = future
+                self.loads += 1
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._values[key] = (time.monotonic(), value)
+            self._values.move_to_end(key)
+            self._evict()
+            del self._in_flight[key]
+        future.set_result(value)
+        return value
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones, down to max_entries."""
+        if len(self._values) <= self.max_entries:
+            return
+        now = time.monotonic()
+        for key in [k for k, (loaded, _) in self._values.items() if now - loaded >= self.ttl_seconds]:
+            del self._values[key]
+        while len(self._values) > self.max_entries:
+            self._values.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._values)
+
+    def clear(self) -> None:
+        """Drop every cached value (in-flight loads are unaffected)."""
+        with self._lock:
+            self._values.clear()
@@ -3,25 +3,77 @@ import pandas as pd
 
 # TODO: check tickers for metrics and news are the same !
 
-def create_newsletter_content(tickers: list[str]) -> str:
-    """Create the newsletter content with news and metrics."""
-    import sys
-    import io
-    from src.data.news_data import get_all_news
+def fetch_metrics(tickers: list[str]) -> pd.DataFrame:
+    """Extract the stock metrics for the tickers."""
     from src.data.stock_data import extract_metrics
 
-    current_date = datetime.now().strftime("%B %d, %Y")
+    return extract_metrics(tickers)
+
+
+def fetch_metrics_and_sparklines(tickers: list[str], cache=None) -> tuple[pd.DataFrame, dict[str, str]]:
+    """
+    Extract the stock metrics and render the 60-day price sparkline of each ticker.
+
+    Sparklines are drawn from the history already fetched for the metrics (no
+    extra Yahoo Finance call) and unchanged ones are reused from `cache`.
+    """
+    from src.data.stock_data import extract_metrics_with_closes
+    from src.utils.sparkline import SparklineCache
+
+    metrics_df, closes = extract_metrics_with_closes(tickers)
+    cache = cache or SparklineCache()
+    return metrics_df, cache.get_many(closes)
+
+
+def fetch_newsletter_data(tickers: list[str]) -> tuple[dict[str, list[str]], pd.DataFrame]:
+    """Fetch the news bullets and metrics needed to render the newsletter."""
+    from src.data.news_data import get_all_news
+
+    # Metrics first: they decide where the LLM budget is spent
+    metrics_df = fetch_metrics(tickers)
+    news_data = get_all_news(tickers, metrics_df=metrics_df)
+
+    return news_data, metrics_df
+
+
+def create_newsletter_content(
+    tickers: list[str],
+    include_sparklines: bool = False,
+    sparkline_cache=None,
+) -> str:
+    """
+    Create the newsletter content with news and metrics.
+
+    Sparklines are opt-in, rendered by `sparkline_cache` (inline SVG by
+    default, for the browser preview). Emails use text sparklines instead,
+    since Gmail strips inline SVG.
+    """
+    if not include_sparklines:
+        news_data, metrics_df = fetch_newsletter_data(tickers)
+        return render_newsletter(tickers, news_data, metrics_df)
+
+    from src.data.news_data import get_all_news
+
+    metrics_df, sparklines = fetch_metrics_and_sparklines(tickers, cache=sparkline_cache)
+    news_data = get_all_news(tickers, metrics_df=metrics_df)
+    return render_newsletter(tickers, news_data, metrics_df, sparklines=sparklines)
 
-    # Get news placeholder data
-    news_data = get_all_news(tickers)
 
-    # Suppress print output from extract_metrics
-    old_stdout = sys.stdout
-    sys.stdout = io.StringIO()
-    try:
-        metrics_df = extract_metrics(tickers)
-    finally:
-        sys.stdout = old_stdout
+def render_newsletter(
+    tickers: list[str],
+    news_data: dict[str, list[str]],
+    metrics_df: pd.DataFrame,
+    part_label: str = "",
+    sparklines: dict[str, str] | None = None,
+) -> str:
+    """
+    Render the newsletter HTML from already fetched news and metrics.
+
+    When `sparklines` (ticker to inline SVG) is given, a 60-day trend column
+    is added to the metrics table.
+    """
+    current_date = datetime.now().strftime("%B %d, %Y")
+    title = f"Portfolio Newsletter{f' ({part_label})' if part_label else ''}"
 
     content = f"""
     <html>
@@ -43,7 +95,7 @@ def create_newsletter_content(tickers: list[str]) -> str:
         </style>
     </head>
     <body>
-        <h2>Portfolio Newsletter</h2>
+        <h2>{title}</h2>
         <p><strong>Daily portfolio update for: {", ".join(tickers)}</strong></p>
         <p><em>Generated on {current_date}</em></p>
 
@@ -68,7 +120,8 @@ def create_newsletter_content(tickers: list[str]) -> str:
         """
 
     # Add metrics section
-    content += """
+    trend_header = "\n                    <th>60d Trend</th>" if sparklines is not None else ""
+    content += f"""
         <h3>Key Metrics</h3>
         <table>
             <thead>
@@ -77,7 +130,7 @@ def create_newsletter_content(tickers: list[str]) -> str:
                     <th>Volatility (10d %)</th>
                     <th>SMA 50d Ratio</th>
                     <th>Momentum (10d %)</th>
-                    <th>Volume Ratio (10d)</th>
+                    <th>Volume Ratio (10d)</th>{trend_header}
                 </tr>
             </thead>
             <tbody>
@@ -123,13 +176,19 @@ def create_newsletter_content(tickers: list[str]) -> str:
         else:
             momentum_display = "N/A"
 
+        # Price sparkline column (only when sparklines are provided)
+        if sparklines is not None:
+            trend_cell = f"\n                    <td>{sparklines.get(ticker) or 'N/A'}</td>"
+        else:
+            trend_cell = ""
+
         content += f"""
                 <tr>
                     <td><strong>{ticker}</strong></td>
                     <td>{volatility if volatility == 'N/A' else f'{volatility:.2f}%'}</td>
                     <td>{sma_display}</td>
                     <td>{momentum_display}</td>
-                    <td>{volume_ratio if volume_ratio == 'N/A' else f'{volume_ratio:.2f}x'}</td>
+                    <td>{volume_ratio if volume_ratio == 'N/A' else f'{volume_ratio:.2f}x'}</td>{trend_cell}
                 </tr>
         """
 
@@ -0,0 +1,200 @@
+"""
+Post-render stage turning newsletter HTML into compact email payloads.
+
+Gmail clips messages above ~102KB, so the rendered newsletter is:
+- minified (insignificant whitespace is removed, in the HTML and in the
+  <style> block, which Gmail supports; inlining the rules on every cell
+  would make the email bigger) and ASCII-only, so that it is sent 7bit
+  instead of base64
+- paired with a generated plain-text alternative
+- split into several parts when it still exceeds the size budget
+"""
+import logging
+import math
+import re
+from html import unescape
+from html.parser import HTMLParser
+
+import pandas as pd
+
+from src.io.email import encoded_size
+from src.utils.email_formatter import render_newsletter
+
+# Stay safely below Gmail's ~102KB clipping threshold (MIME encoded HTML part)
+DEFAULT_MAX_BYTES = 95_000
+
+_STYLE_BLOCK_RE = re.compile(r"<style[^>]*>(.*?)</style>", re.DOTALL | re.IGNORECASE)
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+
+
+def minify_css(css: str) -> str:
+    """Remove comments and insignificant whitespace from a style sheet."""
+    css = _CSS_COMMENT_RE.sub("", css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_html(html: str) -> str:
+    """
+    Remove insignificant whitespace from the HTML.
+
+    Whitespace runs spanning lines are kept as a single newline, which costs
+    the same as a space but keeps lines short enough for a 7bit email body.
+    """
+    html = re.sub(r"\s+", lambda m: "\n" if "\n" in m.group(0) else " ", html)
+    html = re.sub(r"> <", "><", html)
+    return html.strip()
+
+
+class _TextExtractor(HTMLParser):
+    """Convert the newsletter HTML into a readable plain-text version."""
+
+    BLOCK_TAGS = {"p", "div", "h1", "h2", "h3", "h4", "ul", "table", "tr"}
+
+    def __init__(self):
+        super().__init__()
+        self.lines: list[str] = []
+        self.current: list[str] = []
+        self.cells: list[str] | None = None
+        self.skip_depth = 0
+
+    def _flush(self) -> None:
+        line = " ".join("".join(self.current).split())
+        if line:
+            self.lines.append(line)
+        self.current = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("style", "head", "svg"):
+            self.skip_depth += 1
+        elif tag == "li":
+            self._flush()
+            self.current.append("- ")
+        elif tag == "tr":
+            self._flush()
+            self.cells = []
+        elif tag in ("td", "th"):
+            self.current = []
+        elif tag == "br":
+            self._flush()
+        elif tag in self.BLOCK_TAGS:
+            self._flush()
+            if tag in ("h2", "h3", "h4"):
+                self.lines.append("")
+
+    def handle_endtag(self, tag):
+        if tag in ("style", "head", "svg"):
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in ("td", "th") and self.cells is not None:
+            self.cells.append(" ".join("".join(self.current).split()))
+            self.current = []
+        elif tag == "tr" and self.cells is not None:
+            self.lines.append(" | ".join(self.cells))
+            self.cells = None
+        elif tag == "li" or tag in self.BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.current.append(data)
+
+    def text(self) -> str:
+        self._flush()
+        return re.sub(r"\n{3,}", "\n\n", "\n".join(self.lines)).strip() + "\n"
+
+
+def html_to_text(html: str) -> str:
+    """Generate the plain-text alternative of the newsletter HTML."""
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return unescape(extractor.text())
+
+
+def compact_html(html: str) -> str:
+    """Minify the HTML and its <style> block, and escape non-ASCII characters."""
+    html = _STYLE_BLOCK_RE.sub(lambda m: f"<style>{minify_css(m.group(1))}</style>", html)
+    html = minify_html(html)
+    return html.encode("ascii", "xmlcharrefreplace").decode("ascii")
+
+
+def payload_size(payload: dict[str, str]) -> int:
+    """Size in bytes of the HTML and text parts of a payload once MIME encoded."""
+    return encoded_size(payload["html"], "html") + encoded_size(payload["text"], "plain")
+
+
+def html_size(payload: dict[str, str]) -> int:
+    """Size in bytes of the MIME encoded HTML part, which is what Gmail clips."""
+    return encoded_size(payload["html"], "html")
+
+
+def _build_payload(html: str) -> dict[str, str]:
+    compacted = compact_html(html)
+    return {"html": compacted, "text": html_to_text(compacted)}
+
+
+def build_payloads(
+    tickers: list[str],
+    news_data: dict[str, list[str]],
+    metrics_df: pd.DataFrame,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    sparklines: dict[str, str] | None = None,
+) -> list[dict[str, str]]:
+    """
+    Render the newsletter into one or more compact email payloads.
+
+    When the compacted newsletter exceeds `max_bytes`, the tickers are split
+    into consecutive chunks and each chunk is rendered as its own part
+    ("Part 1/3", ...) until every part fits the budget.
+
+    Args:
+        tickers (list[str]): Tickers to include, in display order
+        news_data (dict[str, list[str]]): Ticker to news bullet points
+        metrics_df (pd.DataFrame): Output of `extract_metrics`
+        max_bytes (int): Size budget for the encoded HTML part of a single email
+        sparklines (dict[str, str] | None): Ticker to text price trend (see
+            `sparkline_blocks`); adds a trend column when given
+
+    Returns:
+        list[dict[str, str]]: Payloads with keys:
+            - 'html': Compact HTML part
+            - 'text': Plain-text alternative
+            - 'part_label': Empty for single emails, else e.g. 'Part 1/3'
+    """
+    payload = _build_payload(render_newsletter(tickers, news_data, metrics_df, sparklines=sparklines))
+    payload["part_label"] = ""
+    size = html_size(payload)
+    if size <= max_bytes or len(tickers) <= 1:
+        if size > max_bytes:
+            logging.warning(f"Newsletter HTML of {size} bytes exceeds budget of {max_bytes} bytes")
+        return [payload]
+
+    n_parts = math.ceil(size / max_bytes)
+    while True:
+        chunk_size = math.ceil(len(tickers) / n_parts)
+        chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+        payloads = []
+        for index, chunk in enumerate(chunks, start=1):
+            part_label = f"Part {index}/{len(chunks)}"
+            if "Ticker" in metrics_df.columns:
+                chunk_metrics = metrics_df[metrics_df["Ticker"].isin(chunk)]
+            else:
+                chunk_metrics = metrics_df
+            chunk_payload = _build_payload(
+                render_newsletter(
+                    chunk, news_data, chunk_metrics, part_label=part_label, sparklines=sparklines
+                )
+            )
+            chunk_payload["part_label"] = part_label
+            payloads.append(chunk_payload)
+
+        if chunk_size == 1 or all(html_size(p) <= max_bytes for p in payloads):
+            break
+        n_parts += 1
+
+    logging.info(
+        f"Newsletter HTML of {size} bytes exceeds budget of {max_bytes} bytes, "
+        f"split into {len(payloads)} parts"
+    )
+    return payloads
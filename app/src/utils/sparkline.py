@@ -0,0 +1,222 @@
+"""
+Sparkline generation for the per-ticker price trend column of the newsletter.
+
+Sparklines are built directly from the close prices with numpy (no plotting
+library), in two formats:
+- "blocks": Unicode block characters (e.g. ▁▃▅▇), plain text that survives
+  every mail client (Gmail strips inline SVG), used in the emails
+- "svg": tiny inline SVGs, used in the browser preview
+
+They are cached by ticker + last bar, in memory and optionally on disk, so
+unchanged charts are reused across runs.
+"""
+import hashlib
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+POSITIVE_COLOR = "green"
+NEGATIVE_COLOR = "red"
+
+# Eight levels, from the lowest to the highest price of the period
+BLOCKS = "\u2581\u2582\u2583\u2584\u2585\u2586\u2587\u2588"
+FORMATS = ("svg", "blocks")
+
+
+def downsample(values: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Reduce a series to at most `max_points` values keeping its extremes.
+
+    The series is cut into max_points // 2 buckets and each bucket is replaced
+    by its min and max, in the order they make the line go (min/max envelope).
+
+    Args:
+        values (np.ndarray): 1-D array of prices
+        max_points (int): Maximum number of points to keep
+
+    Returns:
+        np.ndarray: Downsampled values
+    """
+    n = len(values)
+    n_buckets = max_points // 2
+    if n <= max_points or n_buckets < 1:
+        return values
+
+    starts = (np.arange(n_buckets) * n) // n_buckets
+    ends = np.append(starts[1:], n) - 1
+    lows = np.minimum.reduceat(values, starts)
+    highs = np.maximum.reduceat(values, starts)
+    rising = values[ends] >= values[starts]
+
+    points = np.empty(2 * n_buckets, dtype=float)
+    points[0::2] = np.where(rising, lows, highs)
+    points[1::2] = np.where(rising, highs, lows)
+    return points
+
+
+def sparkline_path(values: np.ndarray, width: int, height: int, padding: float = 1.0) -> str:
+    """Build the SVG path data ('M x,y L x,y ...') of a series scaled to the box."""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if len(values) < 2:
+        return ""
+
+    values = downsample(values, width)
+    low, high = values.min(), values.max()
+    span = high - low if high > low else 1.0
+
+    xs = np.linspace(padding, width - padding, len(values))
+    ys = height - padding - (values - low) / span * (height - 2 * padding)
+    # One format call over the interleaved coordinates instead of a per-point loop
+    coords = np.column_stack([xs, ys]).ravel().tolist()
+    return "M" + " L".join(["%.1f,%.1f"] * len(values)) % tuple(coords)
+
+
+def sparkline_svg(values: np.ndarray, width: int = 60, height: int = 16) -> str:
+    """
+    Render a series as an inline SVG sparkline.
+
+    The line is green when the last value is at or above the first one and
+    red otherwise, like the other metrics of the newsletter.
+
+    Args:
+        values (np.ndarray): Close prices, oldest first
+        width (int): Width in pixels (also the maximum number of points drawn)
+        height (int): Height in pixels
+
+    Returns:
+        str: SVG markup, or an empty string if there is not enough data
+    """
+    path = sparkline_path(values, width, height)
+    if not path:
+        return ""
+
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    color = POSITIVE_COLOR if values[-1] >= values[0] else NEGATIVE_COLOR
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}"><path d="{path}" fill="none" '
+        f'stroke="{color}" stroke-width="1.2"/></svg>'
+    )
+
+
+def sparkline_blocks(values: np.ndarray, width: int = 12) -> str:
+    """
+    Render a series as a text sparkline of Unicode block characters.
+
+    Args:
+        values (np.ndarray): Close prices, oldest first
+        width (int): Number of characters (downsampled with the min/max envelope)
+
+    Returns:
+        str: Block characters, or an empty string if there is not enough data
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if len(values) < 2:
+        return ""
+
+    values = downsample(values, width)
+    low, high = values.min(), values.max()
+    span = high - low if high > low else 1.0
+    levels = np.round((values - low) / span * (len(BLOCKS) - 1)).astype(int)
+    return "".join(BLOCKS[level] for level in levels)
+
+
+class SparklineCache:
+    """Reuses sparklines of tickers whose last bar did not change."""
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        width: int = 60,
+        height: int = 16,
+        fmt: str = "svg",
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (str | Path | None): Directory persisting the sparklines
+                across runs; in-memory only when None
+            width (int): Sparkline width in pixels ("svg") or characters ("blocks")
+            height (int): Sparkline height in pixels ("svg" only)
+            fmt (str): "svg" or "blocks" (see module docstring)
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown sparkline format {fmt!r}, expected one of {FORMATS}")
+        self.fmt = fmt
+        self.suffix = ".svg" if fmt == "svg" else ".txt"
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        # Cached file of each ticker on disk, to drop it once outdated
+        self._files: dict[str, Path] = {}
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for path in self.cache_dir.glob(f"*{self.suffix}"):
+                self._files[path.stem.rsplit("-", 1)[0]] = path
+        self.width = width
+        self.height = height
+        self._memory: dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, ticker: str, closes: pd.Series) -> str:
+        last_bar = (
+            f"{ticker}|{len(closes)}|{closes.index[-1]}|{closes.iloc[-1]!r}|{self.fmt}|{self.width}x{self.height}"
+        )
+        return hashlib.sha1(last_bar.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _safe_name(ticker: str) -> str:
+        return "".join(c if c.isalnum() else "_" for c in ticker)
+
+    def get(self, ticker: str, closes: pd.Series) -> str:
+        """
+        Return the sparkline of a ticker, rendering it only if its last bar changed.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            closes (pd.Series): Close prices indexed by date, oldest first
+
+        Returns:
+            str: SVG markup or block characters, or an empty string if there
+            is not enough data
+        """
+        if closes is None or len(closes) < 2:
+            return ""
+
+        key = self._key(ticker, closes)
+        if key in self._memory:
+            self.hits += 1
+            return self._memory[key]
+
+        name = self._safe_name(ticker)
+        path = self.cache_dir / f"{name}-{key}{self.suffix}" if self.cache_dir else None
+        if path is not None and self._files.get(name) == path:
+            sparkline = path.read_text(encoding="utf-8")
+            self.hits += 1
+        else:
+            if self.fmt == "svg":
+                sparkline = sparkline_svg(closes.to_numpy(), self.width, self.height)
+            else:
+                sparkline = sparkline_blocks(closes.to_numpy(), self.width)
+            self.misses += 1
+            if path is not None:
+                try:
+                    # Replace the outdated sparkline of this ticker
+                    if name in self._files:
+                        self._files.pop(name).unlink(missing_ok=True)
+                    path.write_text(sparkline, encoding="utf-8")
+                    self._files[name] = path
+                except OSError as e:
+                    logging.warning(f"Could not cache sparkline of {ticker}: {e}")
+
+        self._memory[key] = sparkline
+        return sparkline
+
+    def get_many(self, closes_by_ticker: dict[str, pd.Series]) -> dict[str, str]:
+        """Sparklines for several tickers (see `get`)."""
+        return {ticker: self.get(ticker, closes) for ticker, closes in closes_by_ticker.items()}
@@ -0,0 +1,28 @@
+"""
+Plain-text helpers shared by the news modules.
+"""
+import re
+from typing import List
+
+
+# Abbreviations ending with a period that do not end a sentence
+ABBREVIATIONS = {
+    "inc", "corp", "co", "ltd", "plc", "llc", "mr", "mrs", "ms", "dr", "st",
+    "jr", "sr", "vs", "etc", "no", "jan", "feb", "mar", "apr", "jun", "jul",
+    "aug", "sep", "sept", "oct", "nov", "dec", "u.s", "u.k", "e.g", "i.e",
+}
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, without breaking after abbreviations such as 'Inc.'."""
+    sentences = []
+    for piece in re.split(r"(?<=[.!?])\s+", text or ""):
+        piece = piece.strip()
+        if not piece:
+            continue
+        last_word = sentences[-1].rsplit(None, 1)[-1].rstrip(".").lower() if sentences else ""
+        if sentences and sentences[-1].endswith(".") and (last_word in ABBREVIATIONS or len(last_word) == 1):
+            sentences[-1] += " " + piece
+        else:
+            sentences.append(piece)
+    return sentences
@@ -0,0 +1,114 @@
+"""Tests of the article ledger deciding which news is summarised again."""
+
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from src.data import news_data
+from src.data.news.article_ledger import ArticleLedger, fingerprint, merge_bullets, split_articles
+from src.data.news.scheduler import SummaryBudget
+
+TODAY = date(2025, 10, 4)
+
+
+class FakeSummarizer:
+    """Summarizer returning one bullet per ticker and counting LLM calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def build_prompt(self, ticker, data, detail="standard", signal=""):
+        return data["raw_info"]
+
+    def summarize(self, ticker, data, detail="standard", signal=""):
+        self.calls.append(ticker)
+        return [f"LLM summary of {ticker}"]
+
+    def summarize_batch(self, news_data):
+        self.calls.extend(news_data)
+        return {ticker: [f"LLM summary of {ticker}"] for ticker in news_data}
+
+
+NEWS = {
+    "AAPL": {"company_name": "Apple", "raw_info": "Apple Inc. beat estimates. Shares rose 3%."},
+    "MSFT": {"company_name": "Microsoft", "raw_info": "Microsoft launched a new product."},
+}
+METRICS = pd.DataFrame(
+    [
+        {"Ticker": "AAPL", "Momentum (10d %)": 5.0, "Volume Ratio (10d)": 2.0},
+        {"Ticker": "MSFT", "Momentum (10d %)": 0.1, "Volume Ratio (10d)": 1.0},
+    ]
+)
+
+
+def test_fingerprint_ignores_case_and_punctuation():
+    assert fingerprint("Apple beat estimates.") == fingerprint("apple beat  estimates!")
+    assert fingerprint("Apple beat estimates.") != fingerprint("Apple missed estimates.")
+    assert fingerprint({"id": "1", "title": "A"}) == fingerprint({"id": "1", "title": "B"})
+
+
+def test_split_articles_keeps_abbreviations():
+    assert split_articles("Apple Inc. beat estimates. Shares rose.") == ["Apple Inc. beat estimates.", "Shares rose."]
+    assert split_articles(["a", "", {"id": "1"}]) == ["a", {"id": "1"}]
+
+
+def test_merge_bullets_puts_fresh_first_without_duplicates():
+    merged = merge_bullets(["New", "Shared"], ["shared", "Old"], max_bullets=5)
+    assert merged == ["New", "Shared", "Old"]
+    assert merge_bullets(["a", "b"], ["c"], max_bullets=2) == ["a", "b"]
+
+
+def test_retention_forgets_old_articles_and_tickers(tmp_path):
+    path = tmp_path / "ledger.json"
+    ledger = ArticleLedger(path, retention_days=7, today=TODAY - timedelta(days=10))
+    ledger.record("OLD", ["Old news."], ["Old bullet"])
+    ledger.save()
+    ledger = ArticleLedger(path, retention_days=7, today=TODAY - timedelta(days=3))
+    ledger.record("AAPL", ["Recent news."], ["Recent bullet"])
+    ledger.save()
+
+    ledger = ArticleLedger(path, retention_days=7, today=TODAY)
+    assert set(ledger.data) == {"AAPL"}
+    assert ledger.new_articles("AAPL", ["Recent news.", "Fresh news."]) == ["Fresh news."]
+    assert ledger.prior_bullets("AAPL") == ["Recent bullet"]
+
+
+def summarize(tmp_path, budget=None, metrics_df=METRICS, summarizer=None):
+    summarizer = summarizer or FakeSummarizer()
+    ledger = ArticleLedger(tmp_path / "ledger.json", today=TODAY)
+    summaries = news_data.summarize_news(
+        list(NEWS), NEWS, summarizer=summarizer, metrics_df=metrics_df, budget=budget, ledger=ledger
+    )
+    return summaries, summarizer.calls
+
+
+def test_only_llm_summaries_are_recorded(tmp_path):
+    # Budget exhausted: extractive bullets are shown but the articles stay new
+    summaries, calls = summarize(tmp_path, budget=SummaryBudget(max_tokens=0))
+    assert calls == []
+    assert summaries["AAPL"] == ["Apple Inc. beat estimates", "Shares rose 3%"]
+    assert ArticleLedger(tmp_path / "ledger.json", today=TODAY).data == {}
+
+    summaries, calls = summarize(tmp_path, budget=SummaryBudget())
+    assert sorted(calls) == ["AAPL", "MSFT"]
+    assert summaries["AAPL"] == ["LLM summary of AAPL"]
+
+    # Nothing new: prior bullets are reused without any LLM call
+    summaries, calls = summarize(tmp_path, budget=SummaryBudget())
+    assert calls == []
+    assert summaries["MSFT"] == ["LLM summary of MSFT"]
+
+
+@pytest.mark.parametrize("metrics_df", [None, METRICS])
+def test_failed_llm_summaries_are_not_recorded(tmp_path, metrics_df):
+    class FailingSummarizer(FakeSummarizer):
+        def summarize(self, ticker, data, detail="standard", signal=""):
+            return []
+
+        def summarize_batch(self, news_data):
+            return {ticker: [] for ticker in news_data}
+
+    summarize(tmp_path, metrics_df=metrics_df, summarizer=FailingSummarizer())
+    _, calls = summarize(tmp_path, metrics_df=metrics_df)
+    assert sorted(calls) == ["AAPL", "MSFT"]
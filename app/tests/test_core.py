@@ -0,0 +1,45 @@
+"""Tests of the checkpointed delivery of the newsletter."""
+
+import pytest
+
+from src import core
+from src.io import email
+from src.io.checkpoint import FAILED, PENDING, SENT, RunCheckpoint
+
+PAYLOADS = [{"html": "<p>Hi</p>", "text": "Hi\n", "part_label": ""}]
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    sent = []
+
+    def fake_send_email(content, recipients, message_id=None, **kwargs):
+        if "down@example.com" in recipients:
+            return False
+        sent.append((recipients[0], message_id))
+        return True
+
+    monkeypatch.setattr(email, "send_email", fake_send_email)
+    return sent
+
+
+def test_interrupted_delivery_is_resent_with_same_message_id(tmp_path, outbox):
+    checkpoint = RunCheckpoint("2025-10-04", tmp_path)
+    checkpoint.set_delivery_status("reader@example.com|0", PENDING)
+
+    core.deliver(checkpoint, PAYLOADS, ["reader@example.com"])
+    core.deliver(checkpoint, PAYLOADS, ["reader@example.com"])
+
+    assert outbox == [("reader@example.com", core._message_id("2025-10-04", "reader@example.com", 0))]
+    assert checkpoint.delivery_status("reader@example.com|0") == SENT
+
+
+def test_failed_delivery_raises_after_other_recipients(tmp_path, outbox):
+    checkpoint = RunCheckpoint("2025-10-04", tmp_path)
+
+    with pytest.raises(core.DeliveryError) as excinfo:
+        core.deliver(checkpoint, PAYLOADS, ["down@example.com", "reader@example.com"])
+
+    assert excinfo.value.failed_keys == ["down@example.com|0"]
+    assert [recipient for recipient, _ in outbox] == ["reader@example.com"]
+    assert checkpoint.delivery_status("down@example.com|0") == FAILED
@@ -0,0 +1,115 @@
+"""Tests of the compact email payload stage."""
+
+import pandas as pd
+import pytest
+
+from src.utils.email_formatter import render_newsletter
+from src.utils.email_payload import (
+    DEFAULT_MAX_BYTES,
+    build_payloads,
+    compact_html,
+    html_size,
+    html_to_text,
+    minify_css,
+    minify_html,
+    payload_size,
+)
+from src.utils.sparkline import BLOCKS
+
+
+def make_newsletter_data(n_tickers: int) -> tuple[list[str], dict[str, list[str]], pd.DataFrame]:
+    tickers = [f"TICK{i}" for i in range(n_tickers)]
+    news = {
+        ticker: [f"{ticker} raised its full-year guidance after strong demand for product {j}" for j in range(3)]
+        for ticker in tickers
+    }
+    metrics_df = pd.DataFrame(
+        [
+            {
+                "Ticker": ticker,
+                "Volatility (10d %)": 2.5,
+                "SMA 50d Ratio": 1.05,
+                "Momentum (10d %)": -1.2,
+                "Volume Ratio (10d)": 0.9,
+            }
+            for ticker in tickers
+        ]
+    )
+    return tickers, news, metrics_df
+
+
+def test_minify_css():
+    css = """
+        /* comment */
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        tr:hover { background-color: #f5f5f5; }
+    """
+    assert minify_css(css) == "body{font-family:Arial,sans-serif;margin:20px}tr:hover{background-color:#f5f5f5}"
+
+
+def test_minify_html_keeps_text_spacing():
+    html = "<ul>\n    <li>Shares   rose</li>\n    <li>Guidance raised</li>\n</ul>"
+    assert minify_html(html) == "<ul>\n<li>Shares rose</li>\n<li>Guidance raised</li>\n</ul>"
+
+
+def test_compact_html_keeps_style_block_and_escapes_non_ascii():
+    html = compact_html(render_newsletter(["AAPL"], {"AAPL": ["Café sales up 5%"]}, pd.DataFrame()))
+    assert html.count("<style>") == 1
+    # Rules stay in the sheet instead of being copied onto every element
+    assert '<li class="news-item">Caf' in html
+    assert "Caf&#233;" in html
+    assert html.isascii()
+
+
+@pytest.mark.parametrize("n_tickers", [1, 100, 300])
+def test_compacted_payload_is_smaller_than_raw_render(n_tickers):
+    raw = render_newsletter(*make_newsletter_data(n_tickers))
+    compacted = {"html": compact_html(raw), "text": html_to_text(raw)}
+    uncompacted = {"html": raw, "text": html_to_text(raw)}
+
+    assert html_size(compacted) < html_size(uncompacted)
+    assert payload_size(compacted) < payload_size(uncompacted)
+
+
+def test_html_to_text():
+    html = compact_html(render_newsletter(*make_newsletter_data(1)))
+    text = html_to_text(html)
+
+    assert "TICK0\n- TICK0 raised its full-year guidance" in text
+    assert "TICK0 | 2.50% | 1.05x | -1.20% | 0.90x" in text
+    assert "<li" not in text and "font-family" not in text
+
+
+@pytest.mark.parametrize("n_tickers, n_parts", [(1, 1), (150, 1), (160, 2), (300, 2), (320, 3)])
+def test_budget_splits_at_expected_ticker_counts(n_tickers, n_parts):
+    tickers, news, metrics_df = make_newsletter_data(n_tickers)
+    payloads = build_payloads(tickers, news, metrics_df)
+
+    assert len(payloads) == n_parts
+    assert all(html_size(payload) <= DEFAULT_MAX_BYTES for payload in payloads)
+    if n_parts == 1:
+        assert payloads[0]["part_label"] == ""
+    else:
+        assert [payload["part_label"] for payload in payloads] == [f"Part {i}/{n_parts}" for i in range(1, n_parts + 1)]
+    # Every ticker appears in exactly one part
+    for ticker in tickers:
+        assert sum(f">{ticker}<" in payload["html"] for payload in payloads) == 1
+
+
+def test_split_without_metrics():
+    tickers, news, _ = make_newsletter_data(20)
+    payloads = build_payloads(tickers, news, pd.DataFrame(), max_bytes=5_000)
+
+    assert len(payloads) > 1
+    assert all(payload["part_label"] for payload in payloads)
+
+
+def test_text_sparklines_survive_compaction():
+    tickers, news, metrics_df = make_newsletter_data(2)
+    sparklines = {"TICK0": BLOCKS[:4], "TICK1": ""}
+    payload = build_payloads(tickers, news, metrics_df, sparklines=sparklines)[0]
+
+    assert "<th>60d Trend</th>" in payload["html"]
+    assert "&#9601;&#9602;&#9603;&#9604;" in payload["html"]
+    assert f"TICK0 | 2.50% | 1.05x | -1.20% | 0.90x | {BLOCKS[:4]}" in payload["text"]
+    assert "TICK1 | 2.50% | 1.05x | -1.20% | 0.90x | N/A" in payload["text"]
@@ -0,0 +1,138 @@
+"""Tests of the service mode against fake loaders."""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pytest
+from fastapi.testclient import TestClient
+
+import service
+from service import NewsletterService, create_app
+from src.io import email
+from src.utils.cache import SingleFlightCache
+
+
+def make_service(max_workers: int = 2, latency: float = 0.02) -> NewsletterService:
+    def metrics_loader(ticker: str) -> dict:
+        time.sleep(latency)
+        return {
+            "Ticker": ticker,
+            "Volatility (10d %)": 2.5,
+            "SMA 50d Ratio": 1.05,
+            "Momentum (10d %)": -1.2,
+            "Volume Ratio (10d)": 0.9,
+        }
+
+    def news_loader(ticker: str) -> list[str]:
+        time.sleep(latency)
+        return ["announces news item"]
+
+    return NewsletterService(metrics_loader=metrics_loader, news_loader=news_loader, max_workers=max_workers)
+
+
+def test_preview_completes_with_more_requests_than_workers():
+    client = TestClient(create_app(make_service(max_workers=2)))
+    n_requests = 16
+
+    def request(i: int) -> int:
+        tickers = ",".join(f"TICK{(i + j) % 8}" for j in range(4))
+        return client.get("/preview", params={"tickers": tickers}).status_code
+
+    # No context manager: on a deadlock, shutting down would wait forever
+    executor = ThreadPoolExecutor(max_workers=n_requests)
+    futures = [executor.submit(request, i) for i in range(n_requests)]
+    done, not_done = wait(futures, timeout=10)
+    executor.shutdown(wait=False)
+
+    assert not not_done, f"{len(not_done)} of {n_requests} previews did not complete"
+    assert all(future.result() == 200 for future in done)
+
+
+def test_concurrent_requests_share_ticker_loads():
+    svc = make_service(max_workers=8, latency=0.1)
+    client = TestClient(create_app(svc))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = list(executor.map(lambda _: client.get("/metrics", params={"tickers": "AAPL"}).status_code, range(8)))
+
+    assert statuses == [200] * 8
+    assert svc.metrics_cache.loads == 1
+
+
+def test_metrics_keeps_sys_stdout():
+    stdout = sys.stdout
+    make_service(max_workers=8).metrics([f"TICK{i}" for i in range(40)])
+    assert sys.stdout is stdout
+
+
+def test_cache_is_bounded():
+    cache = SingleFlightCache(ttl_seconds=60, max_entries=3)
+    for key in range(10):
+        cache.get(key, lambda k=key: k)
+    assert len(cache) == 3
+    assert cache.get(9, lambda: "reloaded") == 9
+    assert cache.get(0, lambda: "reloaded") == "reloaded"
+
+
+@pytest.fixture
+def send_client(monkeypatch, tmp_path):
+    monkeypatch.setattr(service, "SERVICE_API_TOKEN", "secret")
+    monkeypatch.setattr(service, "EMAIL_RECIPIENTS", "reader@example.com")
+    monkeypatch.setattr(service, "STATE_DIR", str(tmp_path))
+    sent = []
+    lock = threading.Lock()
+
+    def fake_send_email(content, recipients, **kwargs):
+        with lock:
+            sent.append(recipients)
+        return True
+
+    monkeypatch.setattr(email, "send_email", fake_send_email)
+    return TestClient(create_app(make_service())), sent
+
+
+def test_send_requires_token(send_client):
+    client, sent = send_client
+    response = client.post("/send", json={"tickers": ["AAPL"]})
+    assert response.status_code == 401
+    assert not sent
+
+
+def test_send_rejects_unknown_recipients(send_client):
+    client, sent = send_client
+    response = client.post(
+        "/send",
+        json={"tickers": ["AAPL"], "recipients": ["someone@else.com"]},
+        headers={"Authorization": "Bearer secret"},
+    )
+    assert response.status_code == 403
+    assert not sent
+
+
+def test_send_does_not_double_send(send_client):
+    client, sent = send_client
+    for _ in range(2):
+        response = client.post("/send", json={"tickers": ["AAPL"]}, headers={"Authorization": "Bearer secret"})
+        assert response.status_code == 200
+    assert sent == [["reader@example.com"]]
+
+
+def test_send_normalises_tickers(send_client):
+    client, sent = send_client
+    for tickers in (["aapl "], ["AAPL"]):
+        response = client.post("/send", json={"tickers": tickers}, headers={"Authorization": "Bearer secret"})
+        assert response.status_code == 200
+    assert sent == [["reader@example.com"]]
+    assert client.app.state.service.metrics_cache.loads == 1
+
+
+def test_preview_shows_text_sparklines_from_metrics_records():
+    svc = make_service()
+    metrics_loader = svc.metrics_loader
+    svc.metrics_loader = lambda ticker: {**metrics_loader(ticker), service.TREND_KEY: "▁█"}
+    html = TestClient(create_app(svc)).get("/preview", params={"tickers": "AAPL"}).text
+
+    assert "<th>60d Trend</th>" in html
+    assert "<td>▁█</td>" in html
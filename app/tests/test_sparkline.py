@@ -0,0 +1,45 @@
+"""Tests of the sparkline generation and cache."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.sparkline import BLOCKS, SparklineCache, sparkline_blocks, sparkline_svg
+
+
+def make_closes(days: int = 60) -> pd.Series:
+    return pd.Series(np.linspace(100, 130, days), index=pd.bdate_range(end="2025-10-03", periods=days))
+
+
+def test_sparkline_blocks():
+    assert sparkline_blocks(np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0]), width=8) == BLOCKS
+    assert len(sparkline_blocks(make_closes().to_numpy(), width=12)) == 12
+    assert sparkline_blocks(np.array([1.0])) == ""
+    assert sparkline_blocks(np.array([2.0, 2.0])) == BLOCKS[0] * 2
+
+
+def test_sparkline_svg_color():
+    assert 'stroke="green"' in sparkline_svg(np.array([1.0, 2.0]))
+    assert 'stroke="red"' in sparkline_svg(np.array([2.0, 1.0]))
+
+
+@pytest.mark.parametrize("fmt", ["svg", "blocks"])
+def test_cache_reuses_unchanged_sparklines_across_runs(tmp_path, fmt):
+    closes = make_closes()
+    first = SparklineCache(tmp_path, width=12, fmt=fmt)
+    sparkline = first.get("AAPL", closes)
+
+    second = SparklineCache(tmp_path, width=12, fmt=fmt)
+    assert second.get("AAPL", closes) == sparkline
+    assert (second.hits, second.misses) == (1, 0)
+
+    # A new bar replaces the cached file of the ticker
+    next_day = pd.concat([closes.iloc[1:], pd.Series([90.0], index=[closes.index[-1] + pd.offsets.BDay()])])
+    second.get("AAPL", next_day)
+    assert second.misses == 1
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_cache_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        SparklineCache(fmt="png")
@@ -30,10 +30,30 @@ resource "google_cloud_run_v2_job" "portfolio_newsletter" {
           value = var.gmail_app_password
         }
 
+        # Persistent job state, see storage.tf
+        env {
+          name  = "STATE_DIR"
+          value = local.state_mount_path
+        }
 
+        volume_mounts {
+          name       = "job-state"
+          mount_path = local.state_mount_path
+        }
       }
-      service_account = google_service_account.service_account.email
-      timeout         = "3600s"
+
+      volumes {
+        name = "job-state"
+        gcs {
+          bucket    = google_storage_bucket.job_state.name
+          read_only = false
+        }
+      }
+
+      # Cloud Storage FUSE volumes require the second generation execution environment
+      execution_environment = "EXECUTION_ENVIRONMENT_GEN2"
+      service_account       = google_service_account.service_account.email
+      timeout               = "3600s"
     }
     parallelism = 1
     task_count  = 1
@@ -21,3 +21,10 @@ resource "google_service_account_iam_member" "scheduler_token_creator" {
   role               = "roles/iam.serviceAccountTokenCreator"
   member             = "serviceAccount:service-${data.google_project.current.number}@gcp-sa-cloudscheduler.iam.gserviceaccount.com"
 }
+
+# Grant the service account read/write access to the job state bucket mounted in the job.
+resource "google_storage_bucket_iam_member" "job_state_user" {
+  bucket = google_storage_bucket.job_state.name
+  role   = "roles/storage.objectUser"
+  member = "serviceAccount:${google_service_account.service_account.email}"
+}
@@ -17,3 +17,8 @@ output "image_path" {
   description = "The full path to the container image in Artifact Registry."
   value       = local.image_path
 }
+
+output "state_bucket" {
+  description = "The Cloud Storage bucket persisting the job state (checkpoints, news ledger)."
+  value       = google_storage_bucket.job_state.name
+}
@@ -0,0 +1,21 @@
+# --- Cloud Storage ---
+# Bucket persisting the job state (run checkpoints, news ledger, sparkline cache)
+# so that a retried or next-day run can reuse it. Mounted in the job with Cloud Storage FUSE.
+
+resource "google_storage_bucket" "job_state" {
+  name                        = "${var.project_id}-${var.app_name}-state-${var.environment}"
+  location                    = var.region
+  uniform_bucket_level_access = true
+  force_destroy               = true
+
+  # Checkpoints are only needed to resume runs of the last few days
+  lifecycle_rule {
+    condition {
+      age            = 14
+      matches_prefix = ["runs/"]
+    }
+    action {
+      type = "Delete"
+    }
+  }
+}